@@ -46,7 +46,9 @@ setup() {
     
     echo "Installing dependencies..."
     pip install --upgrade pip > /dev/null 2>&1
-    pip install --upgrade markdown reportlab pillow beautifulsoup4 pyyaml watchdog pygments > /dev/null 2>&1 || {
+    # One resolver pass over the canonical requirements file; prefer
+    # prebuilt wheels so Pillow/lxml never compile from source
+    pip install --upgrade --prefer-binary -r "$DIR/requirements.txt" > /dev/null 2>&1 || {
         echo -e "${RED}❌ Failed to install dependencies${NC}"
         echo "Please check the log file for details"
         exit 1
@@ -10,10 +10,24 @@ import sys
 import argparse
 import re
 import base64
+import copy
+import functools
+import hashlib
+import json
+import shutil
+import struct
 import tempfile
 import subprocess
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from logging.handlers import (
+    MemoryHandler,
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+)
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple, Union
@@ -23,7 +37,6 @@ import textwrap
 
 # Third-party imports
 import markdown
-from mermaid_cli import render_mermaid_file_sync
 from markdown.extensions import (
     tables,
     fenced_code,
@@ -33,32 +46,531 @@ from markdown.extensions import (
     abbr,
     toc,
 )
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, mm
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage
 from reportlab.platypus import Table, TableStyle, PageBreak, KeepTogether
+from reportlab.platypus import Preformatted
+from reportlab.platypus import ListFlowable, ListItem
 from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
 from reportlab.platypus.frames import Frame
 from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.pdfgen import canvas
+from reportlab.lib.utils import ImageReader, simpleSplit
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from PIL import Image
 from bs4 import BeautifulSoup, Tag
 import yaml
 
+# Prefer the C-backed lxml parser for HTML traversal; the pure-Python
+# html.parser is the slowest option and dominates story-building time
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Markdown extension setup - shared by the converter and the HTML cache key.
+# codehilite is deliberately absent: its Pygments lexing output was
+# re-text-extracted and restyled as plain code anyway, so the highlighting
+# pass was pure cost
+MD_EXTENSIONS = [
+    "tables",
+    "fenced_code",
+    "footnotes",
+    "attr_list",
+    "def_list",
+    "abbr",
+    "toc",
+    "nl2br",
+    "sane_lists",
+    "meta",
+]
+
+# Per-extension settings for the shared converter; also part of the
+# markdown disk-cache key, so edits here invalidate stale HTML
+MD_EXTENSION_CONFIGS = {
+    "fenced_code": {"lang_prefix": "language-"},
+    "toc": {"permalink": False, "baselevel": 1},
+}
+
+# ReportLab validates every attribute set on a flowable when shapeChecking is
+# on; skip that outside debug runs (set DOCBUILDER_DEBUG=1 to re-enable)
+if not os.environ.get("DOCBUILDER_DEBUG"):
+    rl_config.shapeChecking = 0
+
+# Font registration is process-wide in ReportLab, so additional
+# DocumentBuilder instances (e.g. pool workers) must not repeat it
+_FONTS_REGISTERED = False
+
+# Code blocks are pre-chunked into this many lines per flowable so the
+# paginator splits small atomic units instead of probing one giant block
+_CODE_CHUNK_LINES = 40
+
+# Upper bound on entries kept in the finished-PDF cache; the metadata
+# date rotates keys daily, so old entries never get hit again
+_PDF_CACHE_MAX_ENTRIES = 64
+
+# Parsed soup trees retained at once; trees are the largest in-memory
+# artifact per document, so a long-lived builder keeps only a handful
+_SOUP_CACHE_MAX_ENTRIES = 4
+
+# Prefer libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Suffixes routed to the markdown pipeline; anything else in the accepted
+# set is treated as plain text
+_MARKDOWN_SUFFIXES = frozenset({".md", ".markdown"})
+_ACCEPTED_SUFFIXES = frozenset({".md", ".markdown", ".txt"})
+
+# Palette for per-page canvas callbacks and per-table styles, parsed once
+# instead of re-parsing hex strings in every draw call
+_COLOR_TEXT = colors.HexColor("#1a1a1a")
+_COLOR_FOOTER = colors.HexColor("#666666")
+_COLOR_SUBTITLE = colors.HexColor("#444444")
+_COLOR_AUTHOR = colors.HexColor("#888888")
+_COLOR_DATE = colors.HexColor("#aaaaaa")
+_COLOR_TABLE_HEADER_BG = colors.HexColor("#f6f8fa")
+_COLOR_TABLE_GRID = colors.HexColor("#e1e4e8")
+
+# One shared style for every markdown table; TableStyle only records the
+# command list, so a single instance can be applied to any number of tables
+_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), _COLOR_TABLE_HEADER_BG),
+        ("TEXTCOLOR", (0, 0), (-1, 0), _COLOR_TEXT),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 10),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+        ("BACKGROUND", (0, 1), (-1, -1), colors.white),
+        ("GRID", (0, 0), (-1, -1), 1, _COLOR_TABLE_GRID),
+        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 1), (-1, -1), 9),
+        ("PADDING", (0, 0), (-1, -1), 6),
+    ]
+)
+
+# Decoded logo ImageReaders shared by all builders in the process, keyed by
+# (path, mtime) so an updated asset is picked up
+_LOGO_READER_CACHE: Dict[Tuple[str, float], Tuple[ImageReader, float]] = {}
+
+# Precompiled patterns for per-document hot paths
+_H1_TITLE_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+_PARA_CLEAN_RE = re.compile(
+    r'\s*(?:id|class)="[^"]*"|<sup[^>]*><a[^>]*>(\d+)</a></sup>'
+)
+_PARA_SPLIT_RE = re.compile(r"\n\s*\n")
+
+# Mermaid sanitizer patterns, compiled once instead of per diagram
+_MERMAID_ARROW = r"(?:--?>|===?>|\.\.\.>|-\.-?>|-\.->|---)"
+_NEWLINE_RUN_RE = re.compile(r"\n+")
+
+# Codepoint ranges stripped from diagrams. The str.translate deletion
+# table is built lazily on the first non-ASCII diagram: it spans ~120k
+# codepoints, so paying for it at import time would hurt the startup the
+# table is meant to speed up
+_EMOJI_RANGES = (
+    (0x1F600, 0x1F64F),  # emoticons
+    (0x1F300, 0x1F5FF),  # symbols & pictographs
+    (0x1F680, 0x1F6FF),  # transport & map symbols
+    (0x1F1E0, 0x1F1FF),  # flags (iOS)
+    (0x2702, 0x27B0),
+    (0x24C2, 0x1F251),
+    (0x1F900, 0x1F9FF),  # supplemental symbols
+    (0x1FA00, 0x1FAFF),  # more symbols
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _emoji_delete_table() -> Dict[int, None]:
+    return {
+        cp: None
+        for start, end in _EMOJI_RANGES
+        for cp in range(start, end + 1)
+    }
+
+
+_QUOTED_BRACKET_LABEL_RE = re.compile(r'\["([^"]*?)"\]')
+_QUOTED_NODE_LABEL_RE = re.compile(
+    r'\["(?P<bracket>[^"]*?)"\]|\("(?P<paren>[^"]*?)"\)'
+)
+_UNQUOTED_BRACKET_LABEL_RE = re.compile(r'(\b[A-Za-z0-9_]+)\[(?!")([^\]]*?)\]')
+_PIPE_INTERNAL_ARROW_RE = re.compile(
+    rf"\|\s*{_MERMAID_ARROW}\s*(?P<label>\"[^\"]*\"|[^|\"]+?)\|"
+)
+_PIPE_TRAILING_ARROW_RE = re.compile(rf"\|\s*{_MERMAID_ARROW}(?P<spacing>\s*)")
+_ARROW_PIPE_LABEL_RE = re.compile(rf"({_MERMAID_ARROW})\|([^|\n]+?)\|")
+_ARROW_QUOTED_LABEL_RE = re.compile(rf'({_MERMAID_ARROW})\|"([^"]*?)"\|')
+_LEADING_ARROW_RE = re.compile(rf"^{_MERMAID_ARROW}\s*")
+_TRAILING_ARROW_RE = re.compile(rf"\s*{_MERMAID_ARROW}$")
+_SUBGRAPH_TITLE_RE = re.compile(r'\b(subgraph)\s+"([^"]*?)"')
+_ARROW_SPACE_PIPE_RE = re.compile(r"-->\s*\|")
+_REMAIN_BRACKET_RE = re.compile(r'\["[^\]]*\n[^\]]*"\]')
+_REMAIN_PAREN_RE = re.compile(r'\("[^)]*\n[^)]*"\)')
+_REMAIN_EDGE_RE = re.compile(r'\|"[^"]*\n[^"]*"\|')
+
+# Renderer errors that a simplified re-render can plausibly fix; anything
+# else (browser launch, disk, OOM) would fail the same way again
+_RECOVERABLE_MERMAID_ERRORS = (
+    "splitLineToFitWidth",
+    "Parse error",
+    "Lexical error",
+    "Expecting",
+)
+
+# Label shapes replaced by _create_simplified_mermaid
+_SIMPLIFY_BRACKET_RE = re.compile(r'\["[^"]*"\]')
+_SIMPLIFY_PAREN_RE = re.compile(r'\("[^"]*"\)')
+_SIMPLIFY_BRACE_RE = re.compile(r"\{[^}]*\}")
+
+
+def _collapse_br(text: str) -> str:
+    """Collapse runs of <br/> tags using C-level substring replacement."""
+    while "<br/><br/>" in text:
+        text = text.replace("<br/><br/>", "<br/>")
+    return text
+
+
+# Inline <code> spans in serialized paragraph HTML, at any nesting depth
+_INLINE_CODE_RE = re.compile(r"<code>(.*?)</code>")
+
+
+def _clean_paragraph_html(text: str) -> str:
+    """Strip id/class attributes and unwrap footnote links in one scan."""
+    if "id=" not in text and "class=" not in text and "<sup" not in text:
+        return text
+    return _PARA_CLEAN_RE.sub(
+        lambda m: f"<sup>{m.group(1)}</sup>" if m.group(1) else "", text
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_config_cached(config_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse config.yaml once per (path, mtime).
+
+    Repeated DocumentBuilder instantiation within one process reuses the
+    parsed mapping; the mtime key invalidates the cache when the file changes.
+    """
+    with open(config_path, "r") as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
+class CachedSizeRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that tracks the written size itself.
+
+    The stock handler asks the stream for its position on every emit to
+    decide rollover; counting bytes as they are formatted avoids that
+    per-record syscall, and the real position is only consulted when the
+    counter crosses maxBytes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        RotatingFileHandler.__init__(self, *args, **kwargs)
+        try:
+            self._cached_size = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._cached_size = 0
+
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = "%s\n" % self.format(record)
+            self._cached_size += len(msg)
+            if self._cached_size >= self.maxBytes:
+                # Confirm against the real position before rolling over
+                self._cached_size = self.stream.tell() + len(msg)
+                if self._cached_size >= self.maxBytes:
+                    return 1
+        return 0
+
+    def doRollover(self):
+        RotatingFileHandler.doRollover(self)
+        self._cached_size = 0
+
+
+
+def _render_mermaid_file(**kwargs) -> None:
+    """Render a .mmd file via mermaid-cli, imported on first use.
+
+    mermaid-cli pulls in Playwright, the single largest import in the
+    dependency set; deferring it means documents without diagrams never
+    pay that startup cost.
+    """
+    from mermaid_cli import render_mermaid_file_sync
+
+    render_mermaid_file_sync(**kwargs)
+
+
+def _png_size(path: str) -> Tuple[int, int]:
+    """Read PNG dimensions straight from the IHDR chunk.
+
+    Sizing a rendered diagram only needs width and height, which sit at
+    a fixed offset in the first 24 bytes; falling back to Pillow covers
+    anything that is not actually a PNG.
+    """
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if header[:8] == b"\x89PNG\r\n\x1a\n":
+        return struct.unpack(">II", header[16:24])
+    with Image.open(path) as img:
+        return img.size
+
+
+def _quiet_unlink(path) -> bool:
+    """Remove a file, tolerating absence; returns True if one was removed.
+
+    A bare unlink replaces the exists-then-unlink dance: one syscall
+    instead of two, and no window for the file to vanish in between.
+    """
+    if not path:
+        return False
+    try:
+        os.unlink(path)
+        return True
+    except OSError:
+        return False
+
+
+@functools.lru_cache(maxsize=256)
+def _sanitize_mermaid_code(
+    mermaid_code: str, max_label_length: int
+) -> Tuple[str, Tuple[str, ...]]:
+    """Pure Mermaid sanitization pipeline, memoized by input.
+
+    Identical diagram sources (repeated templates, rebuilds) are
+    common, and every pass here is deterministic, so cache hits skip
+    the whole pipeline. Returns (sanitized_code, fixes_applied).
+    """
+    fixes_applied: set = set()
+
+
+    # Edge Case 0: REMOVE ALL EMOJIS (they break Mermaid parsing!)
+    # This is the FIRST thing we do - emojis cause parse errors.
+    # ASCII-only diagrams (the common case) skip the scan outright;
+    # otherwise one C-level translate deletes every emoji codepoint
+    if not mermaid_code.isascii():
+        stripped = mermaid_code.translate(_emoji_delete_table())
+        emoji_count = len(mermaid_code) - len(stripped)
+        if emoji_count > 0:
+            mermaid_code = stripped
+            fixes_applied.add(
+                f"Removed {emoji_count} emojis (cause parse errors)"
+            )
+
+    # Edge Case 1: Multi-line text in node labels WITH quotes (splitLineToFitWidth error)
+    # This is the most common issue - replace ALL newlines inside quotes with <br/>
+    # This includes newlines after existing <br/> tags. Bracket and
+    # paren labels share one alternation so the string is scanned once
+    # for both shapes
+    def replace_multiline_labels_quoted(match):
+        label_content = match.group("bracket")
+        delims = '["{}"]'
+        if label_content is None:
+            label_content = match.group("paren")
+            delims = '("{}")'
+        if "\n" in label_content:
+            # Replace all remaining newlines, even after <br/> tags
+            label_content = _NEWLINE_RUN_RE.sub("<br/>", label_content)
+            # Clean up any double <br/> tags
+            label_content = _collapse_br(label_content)
+            fixes_applied.add("Replaced newlines in labels with <br/> tags")
+        return delims.format(label_content)
+
+    if '["' in mermaid_code or '("' in mermaid_code:
+        mermaid_code = _QUOTED_NODE_LABEL_RE.sub(
+            replace_multiline_labels_quoted, mermaid_code
+        )
+
+    # Edge Case 2: Multi-line text in node labels WITHOUT quotes
+    # Format: A[Text with\nnewlines]
+    def replace_multiline_labels_unquoted(match):
+        prefix = match.group(1)
+        label_content = match.group(2)
+        if "\n" in label_content:
+            # Replace all newlines
+            label_content = _NEWLINE_RUN_RE.sub("<br/>", label_content)
+            # Clean up any double <br/> tags
+            label_content = _collapse_br(label_content)
+            fixes_applied.add("Replaced newlines in labels with <br/> tags")
+        return f'{prefix}["{label_content}"]'
+
+    # Match node definitions like: A[Text] but not A["Text"]
+    if "[" in mermaid_code:
+        mermaid_code = _UNQUOTED_BRACKET_LABEL_RE.sub(
+            replace_multiline_labels_unquoted, mermaid_code
+        )
+
+    # Edge Case 4: Edge/Arrow labels (CRITICAL - MOST COMMON ERROR!)
+    # The TabX diagrams have INVALID double-arrow syntax like:
+    # WRONG:  -->|-->"label"|-->
+    # WRONG:  -->|-->label|-->
+    # RIGHT:  -->|"label"|
+
+    def strip_internal_arrow(match: re.Match) -> str:
+        """Remove stray arrows inside edge labels and ensure quoting."""
+        label = match.group("label").strip()
+        if not (label.startswith('"') and label.endswith('"')):
+            label = f'"{label}"'
+        fixes_applied.add("Fixed triple-arrow edge labels (invalid syntax)")
+        return f"|{label}|"
+
+    # Pipes only appear in edge labels; skip all four edge-label passes
+    # when the diagram has none
+    has_pipes = "|" in mermaid_code
+
+    # Remove arrows that appear between the pipes of an edge label
+    if has_pipes:
+        mermaid_code = _PIPE_INTERNAL_ARROW_RE.sub(
+            strip_internal_arrow, mermaid_code
+        )
+
+    def strip_trailing_arrow(match: re.Match) -> str:
+        """Remove stray arrows appearing immediately after a labelled edge."""
+        spacing = match.group("spacing") or " "
+        fixes_applied.add("Fixed triple-arrow edge labels (invalid syntax)")
+        return f"|{spacing}"
+
+    # Remove arrows that appear immediately after a labelled edge (e.g. |--> Node)
+    if has_pipes:
+        mermaid_code = _PIPE_TRAILING_ARROW_RE.sub(
+            strip_trailing_arrow, mermaid_code
+        )
+
+    def fix_all_edge_label_issues(match):
+        """Clean up edge labels: remove arrows, ensure quotes."""
+        arrow_before = match.group(1)  # Arrow before first pipe
+        content = match.group(2)  # Everything between pipes
+
+        # Remove ALL arrows from content (leading/trailing, with/without spaces)
+        cleaned = _LEADING_ARROW_RE.sub("", content)
+        cleaned = _TRAILING_ARROW_RE.sub("", cleaned)
+        cleaned = cleaned.strip()
+
+        # Ensure content is quoted
+        if not (cleaned.startswith('"') and cleaned.endswith('"')):
+            cleaned = f'"{cleaned}"'
+
+        result = f"{arrow_before}|{cleaned}|"
 
-def setup_logging(repo_path: Path) -> logging.Logger:
-    """Setup comprehensive logging system."""
+        if content != cleaned:  # Only log if we made changes
+            fixes_applied.add("Fixed double-arrow edge labels (invalid syntax)")
+
+        return result
+
+    # Match: arrow + pipe + ANY content + pipe
+    # The [^|\n]+? will match anything except pipes or newlines
+    if has_pipes:
+        before_edge_fix = mermaid_code
+        mermaid_code = _ARROW_PIPE_LABEL_RE.sub(
+            fix_all_edge_label_issues, mermaid_code
+        )
+        if before_edge_fix != mermaid_code:
+            fixes_applied.add("Fixed double-arrow edge labels (invalid syntax)")
+
+    def replace_multiline_edge_labels(match):
+        arrow_type = match.group(1)
+        label_content = match.group(2)
+        if "\n" in label_content:
+            # Replace all newlines
+            label_content = _NEWLINE_RUN_RE.sub("<br/>", label_content)
+            # Clean up any double <br/> tags
+            label_content = _collapse_br(label_content)
+            fixes_applied.add("Replaced newlines in edge labels with <br/> tags")
+        return f'{arrow_type}|"{label_content}"|'
+
+    # Match various arrow types with quoted labels
+    # Covers: -->|, ---|, ==>|, -.->|, -.-|, etc.
+    if has_pipes:
+        mermaid_code = _ARROW_QUOTED_LABEL_RE.sub(
+            replace_multiline_edge_labels, mermaid_code
+        )
+
+    # Edge Case 5: Subgraph titles
+    def replace_multiline_subgraph(match):
+        keyword = match.group(1)
+        title_content = match.group(2)
+        if "\n" in title_content:
+            # Subgraph titles should be single line
+            title_content = _NEWLINE_RUN_RE.sub(" ", title_content)
+            fixes_applied.add("Replaced newlines in subgraph titles")
+        return f'{keyword} "{title_content}"'
+
+    if "subgraph" in mermaid_code:
+        mermaid_code = _SUBGRAPH_TITLE_RE.sub(
+            replace_multiline_subgraph, mermaid_code
+        )
+
+    # Edge Case 6: Very long labels (auto-wrap at word boundaries)
+    def handle_long_labels(match):
+        label = match.group(1)
+        original_length = len(label)  # Store original length before modification
+
+        if len(label) > max_label_length and "<br/>" not in label:
+            lines = textwrap.wrap(
+                label,
+                width=max_label_length,
+                break_long_words=False,
+                break_on_hyphens=False,
+            )
+            label = "<br/>".join(lines)
+            fixes_applied.add(
+                f"Wrapped long label ({original_length} chars -> {len(lines)} lines)"
+            )
+
+        return f'["{label}"]'
+
+    if '["' in mermaid_code:
+        mermaid_code = _QUOTED_BRACKET_LABEL_RE.sub(
+            handle_long_labels, mermaid_code
+        )
+
+    # Edge Case 7: Excessive whitespace
+    lines = mermaid_code.split("\n")
+    cleaned_lines = []
+    for line in lines:
+        line = line.rstrip()
+        if line or (cleaned_lines and not cleaned_lines[-1]):
+            cleaned_lines.append(line)
+
+    if len(cleaned_lines) != len(lines):
+        fixes_applied.add("Cleaned excessive whitespace")
+
+    mermaid_code = "\n".join(cleaned_lines)
+
+    # Edge Case 8: Invalid arrow syntax
+    # NOTE: Do NOT add --> after | in edge labels (-->|"label"| is correct)
+    if _ARROW_SPACE_PIPE_RE.search(mermaid_code):
+        mermaid_code = _ARROW_SPACE_PIPE_RE.sub("-->|", mermaid_code)
+        fixes_applied.add("Fixed arrow syntax (space before pipe)")
+
+    return mermaid_code, tuple(sorted(fixes_applied))
+
+
+def setup_logging(repo_path: Path, log_suffix: str = "") -> logging.Logger:
+    """Setup comprehensive logging system.
+
+    log_suffix lands in the log filename; pool workers pass a per-process
+    suffix so concurrent processes never rotate the same file.
+    """
     log_dir = repo_path / "Logs"
     log_dir.mkdir(exist_ok=True)
 
-    # Create logger
+    # Create logger. Reconfiguring on every DocumentBuilder instantiation
+    # would stack handlers and fan every record out N times, so the first
+    # call wins and later calls reuse the existing setup
     logger = logging.getLogger("DocumentBuilder")
+    if logger.handlers:
+        return logger
     logger.setLevel(logging.DEBUG)
+    logger.propagate = False
 
     # Create formatters
     detailed_formatter = logging.Formatter(
@@ -68,21 +580,44 @@ def setup_logging(repo_path: Path) -> logging.Logger:
     console_formatter = logging.Formatter("%(levelname)s: %(message)s")
 
     # File handler with rotation
-    log_file = log_dir / f"document_builder_{datetime.now().strftime('%Y%m%d')}.log"
-    file_handler = RotatingFileHandler(
+    log_file = (
+        log_dir
+        / f"document_builder_{datetime.now().strftime('%Y%m%d')}{log_suffix}.log"
+    )
+    file_handler = CachedSizeRotatingFileHandler(
         log_file, maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(detailed_formatter)
 
+    # Buffer records in memory so the emit path is a list append instead of
+    # a write per record; errors and shutdown flush the buffer
+    memory_handler = MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True,
+    )
+    memory_handler.setLevel(logging.DEBUG)
+    atexit.register(memory_handler.close)
+
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
 
+    # Hand records off to a background thread: the build thread only does a
+    # queue put, while the listener formats and writes on its own time
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(
+        log_queue, memory_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    logger.addHandler(queue_handler)
 
     logger.info("=" * 60)
     logger.info("Document Builder Started")
@@ -104,7 +639,7 @@ class NumberedCanvas(canvas.Canvas):
     def showPage(self):
         """Called at the end of each page."""
         self.page_num += 1
-        self.logger.debug(f"Page {self.page_num} completed")
+        self.logger.debug("Page %s completed", self.page_num)
         canvas.Canvas.showPage(self)
 
 
@@ -119,45 +654,218 @@ class TOCDocTemplate(SimpleDocTemplate):
 
     def afterFlowable(self, flowable):
         """Called after each flowable is rendered."""
+        # Hot path: called once per flowable per pass. One getattr with a
+        # default replaces the hasattr probe + attribute load pairs, and
+        # non-heading flowables fall straight through
+        bookmark_name = getattr(flowable, "_bookmarkName", None)
+        toc_entry = getattr(flowable, "__toc_entry__", None)
+        if bookmark_name is None and toc_entry is None:
+            return
+
+        canv = self.canv
+
         # Create bookmark if the flowable has a bookmark name
-        if hasattr(flowable, "_bookmarkName"):
-            bookmark_name = flowable._bookmarkName  # type: ignore[attr-defined]
+        if bookmark_name is not None:
             # Create a bookmark at the current position in the PDF
-            self.canv.bookmarkPage(bookmark_name)
+            canv.bookmarkPage(bookmark_name)
             # Add to outline (PDF bookmarks visible in PDF readers)
-            if hasattr(flowable, "__toc_entry__"):
-                level, text, _ = flowable.__toc_entry__  # type: ignore[attr-defined]
-                self.canv.addOutlineEntry(text, bookmark_name, level=level)
-            self.logger.debug(f"Created bookmark: {bookmark_name}")
+            if toc_entry is not None:
+                level, text, _ = toc_entry
+                canv.addOutlineEntry(text, bookmark_name, level=level)
+            self.logger.debug("Created bookmark: %s", bookmark_name)
 
         # Check if this is a heading with TOC entry
-        if hasattr(flowable, "__toc_entry__"):
-            level, text, bookmark = flowable.__toc_entry__  # type: ignore[attr-defined]
+        if toc_entry is not None:
+            level, text, bookmark = toc_entry
             # Get current page number from canvas
-            if hasattr(self.canv, "page_num"):
-                page_num = self.canv.page_num  # type: ignore[attr-defined]
-            else:
+            page_num = getattr(canv, "page_num", None)
+            if page_num is None:
                 page_num = self.page
 
             self.logger.debug(
-                f"TOC Entry detected: Level {level}, Page {page_num}, Text: {text}"
+                "TOC Entry detected: Level %s, Page %s, Text: %s",
+                level,
+                page_num,
+                text,
             )
 
-            # Store entry for second pass
+            # Store entry for later passes
             self.heading_entries.append((level, text, page_num, bookmark))
 
-            # Notify the TOC
+            # Notify via the stock BaseDocTemplate path: it forwards to the
+            # TOC's own notify/addEntry, and keeps the TOC's pass-to-pass
+            # satisfaction check intact so multiBuild stops at the minimum
+            # number of layout passes
             if self.toc:
                 self.notify("TOCEntry", (level, text, page_num, bookmark))
 
-    def notify(self, kind, stuff):
-        """Handle TOC notifications."""
-        if kind == "TOCEntry":
-            level, text, page_num, bookmark = stuff
-            if self.toc and hasattr(self.toc, "addEntry"):
-                # Add the entry to TOC with proper page number
-                self.toc.addEntry(level, text, page_num, bookmark)
-                self.logger.debug(f"Added TOC entry: {text} -> Page {page_num}")
+
+@functools.lru_cache(maxsize=1)
+def _build_document_styles() -> Any:  # StyleSheet1, annotated Any for compatibility
+    """Build the shared document stylesheet once per process.
+
+    Styles are read-only after construction, so every DocumentBuilder
+    instance (and every document) shares one sheet instead of paying
+    getSampleStyleSheet plus a dozen ParagraphStyle allocations each.
+    """
+    styles = getSampleStyleSheet()
+
+    # Custom styles
+    custom_styles = {
+        "CustomTitle": ParagraphStyle(
+            "CustomTitle",
+            parent=styles["Heading1"],
+            fontName="Helvetica-Bold",
+            fontSize=24,
+            textColor=colors.HexColor("#1a1a1a"),
+            spaceAfter=30,
+            alignment=TA_CENTER,
+        ),
+        "CustomHeading1": ParagraphStyle(
+            "CustomHeading1",
+            parent=styles["Heading1"],
+            fontName="Helvetica-Bold",
+            fontSize=20,
+            textColor=colors.HexColor("#1a1a1a"),
+            spaceBefore=24,
+            spaceAfter=12,
+            borderColor=colors.HexColor("#e1e4e8"),
+            borderWidth=0,
+            borderPadding=0,
+        ),
+        "CustomHeading2": ParagraphStyle(
+            "CustomHeading2",
+            parent=styles["Heading2"],
+            fontName="Helvetica-Bold",
+            fontSize=16,
+            textColor=colors.HexColor("#2c3e50"),
+            spaceBefore=18,
+            spaceAfter=10,
+        ),
+        "CustomHeading3": ParagraphStyle(
+            "CustomHeading3",
+            parent=styles["Heading3"],
+            fontName="Helvetica",
+            fontSize=14,
+            textColor=colors.HexColor("#34495e"),
+            spaceBefore=12,
+            spaceAfter=8,
+        ),
+        "CustomBody": ParagraphStyle(
+            "CustomBody",
+            parent=styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=11,
+            textColor=colors.HexColor("#2c3e50"),
+            alignment=TA_JUSTIFY,
+            spaceBefore=6,
+            spaceAfter=6,
+            leading=14,
+            wordWrap="LTR",
+            splitLongWords=1,
+            bulletIndent=0,
+            leftIndent=0,
+            rightIndent=0,
+        ),
+        "CustomBodyLeft": ParagraphStyle(
+            "CustomBodyLeft",
+            parent=styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=11,
+            textColor=colors.HexColor("#2c3e50"),
+            alignment=TA_LEFT,
+            spaceBefore=6,
+            spaceAfter=6,
+            leading=14,
+            wordWrap="LTR",
+            splitLongWords=1,
+            bulletIndent=0,
+            leftIndent=0,
+            rightIndent=0,
+        ),
+        "CustomCode": ParagraphStyle(
+            "CustomCode",
+            parent=styles["Code"],
+            fontName="Courier",
+            fontSize=9,
+            textColor=colors.HexColor("#00ff00"),
+            backColor=colors.HexColor("#000000"),
+            borderColor=colors.HexColor("#333333"),
+            borderWidth=1,
+            borderPadding=8,
+            leftIndent=0,
+            rightIndent=0,
+            spaceAfter=12,
+            spaceBefore=12,
+        ),
+        "CustomInlineCode": ParagraphStyle(
+            "CustomInlineCode",
+            parent=styles["Normal"],
+            fontName="Courier-Bold",
+            fontSize=10,
+            textColor=colors.HexColor("#00c853"),
+        ),
+        "CustomQuote": ParagraphStyle(
+            "CustomQuote",
+            parent=styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=11,
+            textColor=colors.HexColor("#555555"),
+            leftIndent=20,
+            rightIndent=20,
+            spaceBefore=12,
+            spaceAfter=12,
+            borderColor=colors.HexColor("#3498db"),
+            borderWidth=0,
+            borderPadding=12,
+            backColor=colors.HexColor("#f8f9fa"),
+        ),
+        "TOCHeading": ParagraphStyle(
+            "TOCHeading",
+            parent=styles["Heading1"],
+            fontName="Helvetica-Bold",
+            fontSize=24,
+            spaceAfter=20,
+            textColor=colors.HexColor("#1a1a1a"),
+            alignment=TA_CENTER,
+        ),
+        "TOCEntry1": ParagraphStyle(
+            "TOCEntry1",
+            parent=styles["Normal"],
+            fontName="Helvetica",
+            fontSize=12,
+            leftIndent=0,
+            rightIndent=30,
+            spaceAfter=6,
+            textColor=colors.HexColor("#0066cc"),  # Blue for links
+        ),
+        "TOCEntry2": ParagraphStyle(
+            "TOCEntry2",
+            parent=styles["Normal"],
+            fontName="Helvetica",
+            fontSize=11,
+            leftIndent=20,
+            rightIndent=30,
+            spaceAfter=4,
+            textColor=colors.HexColor("#0066cc"),  # Blue for links
+        ),
+        "TOCEntry3": ParagraphStyle(
+            "TOCEntry3",
+            parent=styles["Normal"],
+            fontName="Helvetica",
+            fontSize=10,
+            leftIndent=40,
+            rightIndent=30,
+            spaceAfter=3,
+            textColor=colors.HexColor("#0066cc"),  # Blue for links
+        ),
+    }
+
+    # Add custom styles to the style sheet
+    for style in custom_styles.values():
+        styles.add(style)
+
+    return styles
 
 
 class DocumentBuilder:
@@ -177,20 +885,144 @@ class DocumentBuilder:
 
         # Ensure output directory exists
         self.output_dir.mkdir(exist_ok=True)
-        self.logger.debug(f"Output directory: {self.output_dir}")
+        self.logger.debug("Output directory: %s", self.output_dir)
+        # pillow-simd ships the same PIL namespace with a ".postN" version
+        # suffix; surface which build is active for perf triage
+        self.logger.debug("Pillow build: %s", getattr(Image, "__version__", "unknown"))
 
         # Track temporary files for cleanup after PDF is built
         self.temp_files = []
 
+        # Cache Markdown->HTML conversions by content hash
+        # In-memory dict for repeated builds within one run, disk cache across runs
+        self._md_cache_dir = self.output_dir / ".md_cache"
+        # Rendered Mermaid PNGs keyed by sanitized source + render settings;
+        # a hit skips the whole headless-browser render
+        self._mermaid_cache_dir = self.output_dir / ".mermaid_cache"
+        # Finished PDFs keyed by source content + config + cover metadata;
+        # unchanged documents are copied out instead of rebuilt
+        self._pdf_cache_dir = self.output_dir / ".pdf_cache"
+        self._html_cache = {}
+        # Second-level cache: parsed soup trees keyed by their HTML, so a
+        # repeated document skips BeautifulSoup construction too
+        # Bounded: see _SOUP_CACHE_MAX_ENTRIES
+        self._soup_cache: Dict[str, BeautifulSoup] = {}
+
+        # Shared Markdown converter - extension registration is expensive, so
+        # build it once and reset() between documents instead of rebuilding
+        self._md = markdown.Markdown(
+            extensions=MD_EXTENSIONS,
+            extension_configs=MD_EXTENSION_CONFIGS,
+        )
+
         # Load configuration
         self.config = self._load_config()
 
         # Register fonts
         self._register_fonts()
 
+        # Cache the logo once as an ImageReader; passing a path to drawImage
+        # makes ReportLab re-decode the PNG on every page. The cache is
+        # module-level and keyed by (path, mtime) so every builder in the
+        # process shares one decode per asset version
+        self._logo_reader: Optional[ImageReader] = None
+        self._logo_aspect = 1.0
+        # (path, mtime) of the logo in use; folded into the finished-PDF
+        # cache key so swapping the asset invalidates cached builds
+        self._logo_cache_key: Optional[Tuple[str, float]] = None
+        logo_path = self.assets_dir / "GerdsenAI_Neural_G_Invoice.png"
+        if logo_path.exists():
+            key = (str(logo_path), logo_path.stat().st_mtime)
+            self._logo_cache_key = key
+            cached = _LOGO_READER_CACHE.get(key)
+            if cached is None:
+                try:
+                    with Image.open(logo_path) as img:
+                        aspect = img.height / img.width
+                        # Pre-size to 2x the largest drawn size (2.5in on the
+                        # cover) and re-save optimized, so every drawImage
+                        # embeds a small PNG instead of re-encoding the full
+                        # asset
+                        max_px = int(5 * inch)
+                        if max(img.size) > max_px:
+                            img.thumbnail((max_px, max_px), Image.LANCZOS)
+                        buf = io.BytesIO()
+                        img.save(buf, "PNG", optimize=True)
+                        buf.seek(0)
+                        self.logger.debug(
+                            f"Cached optimized logo thumbnail: {img.width}x{img.height}"
+                        )
+                    cached = (ImageReader(buf), aspect)
+                    _LOGO_READER_CACHE[key] = cached
+                except Exception as e:
+                    self.logger.warning(f"Could not cache logo: {e}")
+            if cached is not None:
+                self._logo_reader, self._logo_aspect = cached
+
+        # Precompute the footer logo's fitted size and centring offsets for
+        # its 1in x 0.4in box, so drawImage skips the per-page
+        # preserveAspectRatio arithmetic
+        self._footer_logo_size = (0.0, 0.0)
+        self._footer_logo_offset = (0.0, 0.0)
+        if self._logo_reader is not None:
+            box_w, box_h = inch, 0.4 * inch
+            fit_w = min(box_w, box_h / self._logo_aspect)
+            fit_h = fit_w * self._logo_aspect
+            self._footer_logo_size = (fit_w, fit_h)
+            self._footer_logo_offset = ((box_w - fit_w) / 2, (box_h - fit_h) / 2)
+
         # Setup styles
         self.styles = self._setup_styles()
 
+        # Story-loop dispatch: O(1) handler lookup per element instead of a
+        # string-compare chain over every tag name
+        self._tag_handlers = {
+            "h1": self._emit_heading,
+            "h2": self._emit_heading,
+            "h3": self._emit_heading,
+            "p": self._emit_paragraph,
+            "pre": self._emit_pre,
+            "blockquote": self._emit_blockquote,
+            "ul": self._emit_list,
+            "ol": self._emit_list,
+            "table": self._emit_table,
+        }
+
+        # Heading style, TOC level, and trailing space indexed by tag name
+        self._heading_specs = {
+            "h1": (self.styles["CustomHeading1"], 0, 0.2 * inch),
+            "h2": (self.styles["CustomHeading2"], 1, 0.15 * inch),
+            "h3": (self.styles["CustomHeading3"], 2, 0.1 * inch),
+        }
+
+        # Resolved input paths, keyed by the caller-supplied name
+        self._resolved_paths: Dict[str, Path] = {}
+
+        # In-flight Mermaid render futures keyed by diagram source
+        self._mermaid_prefetch: Dict[str, Any] = {}
+
+        # Whether the document currently being built mentions mermaid at
+        # all; lets the <pre> branch skip class inspection entirely
+        self._has_mermaid = False
+
+        # Covers are on by default; build_document refreshes this from the
+        # config so the footer hook knows whether page 1 is a cover
+        self._cover_enabled = True
+
+        # Set when any Mermaid render degrades (simplified or code-block
+        # fallback) during the current build; such PDFs must not be cached
+        self._render_degraded = False
+
+        # Usable drawing area, fixed for the life of the builder: A4 minus
+        # the configured margins, with an inch reserved vertically for the
+        # header/footer band. Diagram scaling reads these instead of
+        # re-deriving them per image
+        margins = self.config["margins"]
+        self._page_width = A4[0] - (margins["left"] + margins["right"]) * mm
+        self._page_height = (
+            A4[1] - (margins["top"] + margins["bottom"]) * mm - 72
+        )
+
         # Initialize TOC tracking
         self.toc_entries = []
         self.current_toc = None
@@ -201,7 +1033,7 @@ class DocumentBuilder:
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from config.yaml or use defaults."""
         config_path = self.repo_path / "config.yaml"
-        self.logger.debug(f"Loading config from: {config_path}")
+        self.logger.debug("Loading config from: %s", config_path)
 
         default_config = {
             "title": "Document",
@@ -220,12 +1052,17 @@ class DocumentBuilder:
 
         if config_path.exists():
             try:
-                with open(config_path, "r") as f:
-                    yaml_config = yaml.safe_load(f)
-                    if yaml_config and "default" in yaml_config:
-                        default_config.update(yaml_config["default"])
-                    if "margins" in yaml_config:
-                        default_config["margins"] = yaml_config["margins"]
+                # Deep-copy the cached parse so per-instance mutation (e.g.
+                # mermaid prompt settings) cannot leak between builders
+                yaml_config = copy.deepcopy(
+                    _parse_config_cached(
+                        str(config_path), config_path.stat().st_mtime
+                    )
+                )
+                if yaml_config and "default" in yaml_config:
+                    default_config.update(yaml_config["default"])
+                if "margins" in yaml_config:
+                    default_config["margins"] = yaml_config["margins"]
                 self.logger.debug("Config loaded successfully")
             except Exception as e:
                 self.logger.warning(f"Could not load config.yaml: {e}")
@@ -235,162 +1072,29 @@ class DocumentBuilder:
         return default_config
 
     def _register_fonts(self):
-        """Register fonts with ReportLab."""
+        """Register fonts with ReportLab (once per process)."""
+        global _FONTS_REGISTERED
+        if _FONTS_REGISTERED:
+            self.logger.debug("Fonts already registered in this process")
+            return
+
         try:
             self.logger.debug("Registering fonts")
-            # ReportLab has built-in support for these fonts
+            # ReportLab has built-in support for these fonts; skip any that a
+            # previous registration in this process already provided
+            registered = set(pdfmetrics.getRegisteredFontNames())
+            self.logger.debug("%s fonts already registered", len(registered))
             self.logger.info("Using built-in ReportLab fonts for better compatibility")
+            _FONTS_REGISTERED = True
         except Exception as e:
             self.logger.error(f"Font registration error: {e}")
 
     def _setup_styles(
         self,
     ) -> Any:  # Return StyleSheet1, but annotated as Any for compatibility
-        """Setup paragraph styles for the document."""
-        self.logger.debug("Setting up document styles")
-        styles = getSampleStyleSheet()
-
-        # Custom styles
-        custom_styles = {
-            "CustomTitle": ParagraphStyle(
-                "CustomTitle",
-                parent=styles["Heading1"],
-                fontName="Helvetica-Bold",
-                fontSize=24,
-                textColor=colors.HexColor("#1a1a1a"),
-                spaceAfter=30,
-                alignment=TA_CENTER,
-            ),
-            "CustomHeading1": ParagraphStyle(
-                "CustomHeading1",
-                parent=styles["Heading1"],
-                fontName="Helvetica-Bold",
-                fontSize=20,
-                textColor=colors.HexColor("#1a1a1a"),
-                spaceBefore=24,
-                spaceAfter=12,
-                borderColor=colors.HexColor("#e1e4e8"),
-                borderWidth=0,
-                borderPadding=0,
-            ),
-            "CustomHeading2": ParagraphStyle(
-                "CustomHeading2",
-                parent=styles["Heading2"],
-                fontName="Helvetica-Bold",
-                fontSize=16,
-                textColor=colors.HexColor("#2c3e50"),
-                spaceBefore=18,
-                spaceAfter=10,
-            ),
-            "CustomHeading3": ParagraphStyle(
-                "CustomHeading3",
-                parent=styles["Heading3"],
-                fontName="Helvetica",
-                fontSize=14,
-                textColor=colors.HexColor("#34495e"),
-                spaceBefore=12,
-                spaceAfter=8,
-            ),
-            "CustomBody": ParagraphStyle(
-                "CustomBody",
-                parent=styles["BodyText"],
-                fontName="Helvetica",
-                fontSize=11,
-                textColor=colors.HexColor("#2c3e50"),
-                alignment=TA_JUSTIFY,
-                spaceBefore=6,
-                spaceAfter=6,
-                leading=14,
-                wordWrap="LTR",
-                splitLongWords=1,
-                bulletIndent=0,
-                leftIndent=0,
-                rightIndent=0,
-            ),
-            "CustomCode": ParagraphStyle(
-                "CustomCode",
-                parent=styles["Code"],
-                fontName="Courier",
-                fontSize=9,
-                textColor=colors.HexColor("#00ff00"),
-                backColor=colors.HexColor("#000000"),
-                borderColor=colors.HexColor("#333333"),
-                borderWidth=1,
-                borderPadding=8,
-                leftIndent=0,
-                rightIndent=0,
-                spaceAfter=12,
-                spaceBefore=12,
-            ),
-            "CustomInlineCode": ParagraphStyle(
-                "CustomInlineCode",
-                parent=styles["Normal"],
-                fontName="Courier-Bold",
-                fontSize=10,
-                textColor=colors.HexColor("#00c853"),
-            ),
-            "CustomQuote": ParagraphStyle(
-                "CustomQuote",
-                parent=styles["BodyText"],
-                fontName="Helvetica",
-                fontSize=11,
-                textColor=colors.HexColor("#555555"),
-                leftIndent=20,
-                rightIndent=20,
-                spaceBefore=12,
-                spaceAfter=12,
-                borderColor=colors.HexColor("#3498db"),
-                borderWidth=0,
-                borderPadding=12,
-                backColor=colors.HexColor("#f8f9fa"),
-            ),
-            "TOCHeading": ParagraphStyle(
-                "TOCHeading",
-                parent=styles["Heading1"],
-                fontName="Helvetica-Bold",
-                fontSize=24,
-                spaceAfter=20,
-                textColor=colors.HexColor("#1a1a1a"),
-                alignment=TA_CENTER,
-            ),
-            "TOCEntry1": ParagraphStyle(
-                "TOCEntry1",
-                parent=styles["Normal"],
-                fontName="Helvetica",
-                fontSize=12,
-                leftIndent=0,
-                rightIndent=30,
-                spaceAfter=6,
-                textColor=colors.HexColor("#0066cc"),  # Blue for links
-            ),
-            "TOCEntry2": ParagraphStyle(
-                "TOCEntry2",
-                parent=styles["Normal"],
-                fontName="Helvetica",
-                fontSize=11,
-                leftIndent=20,
-                rightIndent=30,
-                spaceAfter=4,
-                textColor=colors.HexColor("#0066cc"),  # Blue for links
-            ),
-            "TOCEntry3": ParagraphStyle(
-                "TOCEntry3",
-                parent=styles["Normal"],
-                fontName="Helvetica",
-                fontSize=10,
-                leftIndent=40,
-                rightIndent=30,
-                spaceAfter=3,
-                textColor=colors.HexColor("#0066cc"),  # Blue for links
-            ),
-        }
-
-        # Add custom styles to the style sheet
-        for name, style in custom_styles.items():
-            styles.add(style)
-
-        self.logger.debug(f"Created {len(custom_styles)} custom styles")
-        return styles
+        """Return the shared per-process document stylesheet."""
+        self.logger.debug("Using shared document styles")
+        return _build_document_styles()
 
     def _create_toc(self):
         """Create a table of contents."""
@@ -413,29 +1117,39 @@ class DocumentBuilder:
         self.logger.debug("Extracting metadata from content")
         metadata = self.config.copy()
 
-        # Check for YAML front matter
+        # Check for YAML front matter - one partition instead of repeated scans
         if content.startswith("---"):
-            try:
-                end_index = content.index("---", 3)
-                front_matter = content[3:end_index].strip()
-                content = content[end_index + 3 :].strip()
-
-                # Parse front matter
-                for line in front_matter.split("\n"):
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        metadata[key.strip().lower()] = value.strip()
-
-                self.logger.debug(f"Extracted metadata: {list(metadata.keys())}")
-            except ValueError:
+            front_matter, sep, body = content[3:].partition("\n---")
+            if sep:
+                content = body.strip()
+
+                try:
+                    parsed = yaml.load(front_matter, Loader=_YAML_LOADER) or {}
+                except yaml.YAMLError as e:
+                    self.logger.warning(f"Front matter is not valid YAML: {e}")
+                    # Fall back to the simple key: value line parser
+                    parsed = {}
+                    for line in front_matter.split("\n"):
+                        if ":" in line:
+                            key, value = line.split(":", 1)
+                            parsed[key.strip()] = value.strip()
+
+                if isinstance(parsed, dict):
+                    for key, value in parsed.items():
+                        metadata[str(key).strip().lower()] = (
+                            value if isinstance(value, str) else str(value)
+                        )
+
+                self.logger.debug("Extracted metadata: %s", list(metadata.keys()))
+            else:
                 self.logger.warning("No closing --- found for front matter")
 
         # Extract title from first H1 if not in metadata
         if metadata.get("title") == "Document":
-            title_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
+            title_match = _H1_TITLE_RE.search(content)
             if title_match:
                 metadata["title"] = title_match.group(1)
-                self.logger.debug(f"Extracted title from H1: {metadata['title']}")
+                self.logger.debug("Extracted title from H1: %s", metadata['title'])
 
         return content, metadata
 
@@ -470,288 +1184,21 @@ class DocumentBuilder:
         Returns:
             Tuple of (sanitized_code, list_of_fixes_applied)
         """
-        original_code = mermaid_code
-        fixes_applied = []
-
-        # Get configuration
         mermaid_config = self.config.get("mermaid", {})
         max_label_length = mermaid_config.get("max_label_length", 80)
 
-        # Edge Case 0: REMOVE ALL EMOJIS (they break Mermaid parsing!)
-        # This is the FIRST thing we do - emojis cause parse errors
-        emoji_pattern = re.compile(
-            "["
-            "\U0001f600-\U0001f64f"  # emoticons
-            "\U0001f300-\U0001f5ff"  # symbols & pictographs
-            "\U0001f680-\U0001f6ff"  # transport & map symbols
-            "\U0001f1e0-\U0001f1ff"  # flags (iOS)
-            "\U00002702-\U000027b0"
-            "\U000024c2-\U0001f251"
-            "\U0001f900-\U0001f9ff"  # supplemental symbols
-            "\U0001fa00-\U0001faff"  # more symbols
-            "]+",
-            flags=re.UNICODE,
-        )
-
-        emoji_count = len(emoji_pattern.findall(mermaid_code))
-        if emoji_count > 0:
-            mermaid_code = emoji_pattern.sub("", mermaid_code)
-            fixes_applied.append(f"Removed {emoji_count} emojis (cause parse errors)")
-            self.logger.debug(f"Stripped {emoji_count} emojis from Mermaid diagram")
-
-        # Edge Case 1: Multi-line text in node labels WITH quotes (splitLineToFitWidth error)
-        # This is the most common issue - replace ALL newlines inside quotes with <br/>
-        # This includes newlines after existing <br/> tags
-        def replace_multiline_labels_quoted(match):
-            label_content = match.group(1)
-            if "\n" in label_content:
-                # Replace all remaining newlines, even after <br/> tags
-                label_content = re.sub(r"\n+", "<br/>", label_content)
-                # Clean up any double <br/> tags
-                label_content = re.sub(r"(<br/>)+", "<br/>", label_content)
-                if "Replaced newlines in labels with <br/> tags" not in fixes_applied:
-                    fixes_applied.append("Replaced newlines in labels with <br/> tags")
-            return f'["{label_content}"]'
-
-        mermaid_code = re.sub(
-            r'\["([^"]*?)"\]',
-            replace_multiline_labels_quoted,
-            mermaid_code,
-            flags=re.DOTALL,
-        )
-
-        # Edge Case 2: Multi-line text in node labels WITHOUT quotes
-        # Format: A[Text with\nnewlines]
-        def replace_multiline_labels_unquoted(match):
-            prefix = match.group(1)
-            label_content = match.group(2)
-            if "\n" in label_content:
-                # Replace all newlines
-                label_content = re.sub(r"\n+", "<br/>", label_content)
-                # Clean up any double <br/> tags
-                label_content = re.sub(r"(<br/>)+", "<br/>", label_content)
-                if "Replaced newlines in labels with <br/> tags" not in fixes_applied:
-                    fixes_applied.append("Replaced newlines in labels with <br/> tags")
-            return f'{prefix}["{label_content}"]'
-
-        # Match node definitions like: A[Text] but not A["Text"]
-        mermaid_code = re.sub(
-            r'(\b[A-Za-z0-9_]+)\[(?!")([^\]]*?)\]',
-            replace_multiline_labels_unquoted,
-            mermaid_code,
-            flags=re.DOTALL,
-        )
-
-        # Edge Case 3: Multi-line text in parentheses labels
-        def replace_multiline_parens(match):
-            label_content = match.group(1)
-            if "\n" in label_content:
-                # Replace all newlines
-                label_content = re.sub(r"\n+", "<br/>", label_content)
-                # Clean up any double <br/> tags
-                label_content = re.sub(r"(<br/>)+", "<br/>", label_content)
-                if "Replaced newlines in labels with <br/> tags" not in fixes_applied:
-                    fixes_applied.append("Replaced newlines in labels with <br/> tags")
-            return f'("{label_content}")'
-
-        mermaid_code = re.sub(
-            r'\("([^"]*?)"\)', replace_multiline_parens, mermaid_code, flags=re.DOTALL
-        )
-
-        # Edge Case 4: Edge/Arrow labels (CRITICAL - MOST COMMON ERROR!)
-        # The TabX diagrams have INVALID double-arrow syntax like:
-        # WRONG:  -->|-->"label"|-->
-        # WRONG:  -->|-->label|-->
-        # RIGHT:  -->|"label"|
-
-        arrow_token = r"(?:--?>|===?>|\.\.\.>|-\.-?>|-\.->|---)"
-
-        def strip_internal_arrow(match: re.Match) -> str:
-            """Remove stray arrows inside edge labels and ensure quoting."""
-            label = match.group("label").strip()
-            if not (label.startswith('"') and label.endswith('"')):
-                label = f'"{label}"'
-            if "Fixed triple-arrow edge labels (invalid syntax)" not in fixes_applied:
-                fixes_applied.append("Fixed triple-arrow edge labels (invalid syntax)")
-            return f"|{label}|"
-
-        # Remove arrows that appear between the pipes of an edge label
-        mermaid_code = re.sub(
-            rf"\|\s*{arrow_token}\s*(?P<label>\"[^\"]*\"|[^|\"]+?)\|",
-            strip_internal_arrow,
-            mermaid_code,
-            flags=re.DOTALL,
-        )
-
-        def strip_trailing_arrow(match: re.Match) -> str:
-            """Remove stray arrows appearing immediately after a labelled edge."""
-            spacing = match.group("spacing") or " "
-            if "Fixed triple-arrow edge labels (invalid syntax)" not in fixes_applied:
-                fixes_applied.append("Fixed triple-arrow edge labels (invalid syntax)")
-            return f"|{spacing}"
-
-        # Remove arrows that appear immediately after a labelled edge (e.g. |--> Node)
-        mermaid_code = re.sub(
-            rf"\|\s*{arrow_token}(?P<spacing>\s*)",
-            strip_trailing_arrow,
-            mermaid_code,
-        )
-
-        def fix_all_edge_label_issues(match):
-            """Clean up edge labels: remove arrows, ensure quotes."""
-            arrow_before = match.group(1)  # Arrow before first pipe
-            content = match.group(2)  # Everything between pipes
-
-            # Remove ALL arrows from content (leading/trailing, with/without spaces)
-            cleaned = content
-            cleaned = re.sub(
-                r"^(?:--?>|===?>|\.\.\.>|-\.-?>|-\.->|---)\s*", "", cleaned
-            )
-            cleaned = re.sub(
-                r"\s*(?:--?>|===?>|\.\.\.>|-\.-?>|-\.->|---)$", "", cleaned
-            )
-            cleaned = cleaned.strip()
-
-            # Ensure content is quoted
-            if not (cleaned.startswith('"') and cleaned.endswith('"')):
-                cleaned = f'"{cleaned}"'
-
-            result = f"{arrow_before}|{cleaned}|"
-
-            if content != cleaned:  # Only log if we made changes
-                if (
-                    "Fixed double-arrow edge labels (invalid syntax)"
-                    not in fixes_applied
-                ):
-                    fixes_applied.append(
-                        "Fixed double-arrow edge labels (invalid syntax)"
-                    )
-
-            return result
-
-        # Match: arrow + pipe + ANY content + pipe
-        # The [^|\n]+? will match anything except pipes or newlines
-        before_edge_fix = mermaid_code
-        mermaid_code = re.sub(
-            r"((?:--?>|===?>|\.\.\.>|-\.-?>|-\.->|---))\|([^|\n]+?)\|",
-            fix_all_edge_label_issues,
-            mermaid_code,
-        )
-        if (
-            before_edge_fix != mermaid_code
-            and "Fixed double-arrow edge labels (invalid syntax)" not in fixes_applied
-        ):
-            fixes_applied.append("Fixed double-arrow edge labels (invalid syntax)")
-
-        def replace_multiline_edge_labels(match):
-            arrow_type = match.group(1)
-            label_content = match.group(2)
-            if "\n" in label_content:
-                # Replace all newlines
-                label_content = re.sub(r"\n+", "<br/>", label_content)
-                # Clean up any double <br/> tags
-                label_content = re.sub(r"(<br/>)+", "<br/>", label_content)
-                if (
-                    "Replaced newlines in edge labels with <br/> tags"
-                    not in fixes_applied
-                ):
-                    fixes_applied.append(
-                        "Replaced newlines in edge labels with <br/> tags"
-                    )
-            return f'{arrow_type}|"{label_content}"|'
-
-        # Match various arrow types with quoted labels
-        # Covers: -->|, ---|, ==>|, -.->|, -.-|, etc.
-        mermaid_code = re.sub(
-            r'((?:--?>|===?>|\.\.\.>|-\.-?>|-\.->|---))\|"([^"]*?)"\|',
-            replace_multiline_edge_labels,
-            mermaid_code,
-            flags=re.DOTALL,
-        )
-
-        # Edge Case 5: Subgraph titles
-        def replace_multiline_subgraph(match):
-            keyword = match.group(1)
-            title_content = match.group(2)
-            if "\n" in title_content:
-                title_content = re.sub(
-                    r"\n+", " ", title_content
-                )  # Subgraph titles should be single line
-                if "Replaced newlines in subgraph titles" not in fixes_applied:
-                    fixes_applied.append("Replaced newlines in subgraph titles")
-            return f'{keyword} "{title_content}"'
-
-        mermaid_code = re.sub(
-            r'\b(subgraph)\s+"([^"]*?)"',
-            replace_multiline_subgraph,
-            mermaid_code,
-            flags=re.DOTALL,
+        mermaid_code, fixes = _sanitize_mermaid_code(
+            mermaid_code, max_label_length
         )
+        fixes_applied = list(fixes)
 
-        # Edge Case 6: Very long labels (auto-wrap at word boundaries)
-        def handle_long_labels(match):
-            label = match.group(1)
-            original_length = len(label)  # Store original length before modification
-
-            if len(label) > max_label_length and "<br/>" not in label:
-                words = label.split()
-                lines = []
-                current_line = []
-                current_length = 0
-
-                for word in words:
-                    if current_length + len(word) + 1 > max_label_length:
-                        lines.append(" ".join(current_line))
-                        current_line = [word]
-                        current_length = len(word)
-                    else:
-                        current_line.append(word)
-                        current_length += len(word) + 1
-
-                if current_line:
-                    lines.append(" ".join(current_line))
-
-                label = "<br/>".join(lines)
-                fixes_applied.append(
-                    f"Wrapped long label ({original_length} chars -> {len(lines)} lines)"
-                )
-
-            return f'["{label}"]'
-
-        mermaid_code = re.sub(r'\["([^"]*?)"\]', handle_long_labels, mermaid_code)
-
-        # Edge Case 7: Excessive whitespace
-        lines = mermaid_code.split("\n")
-        cleaned_lines = []
-        for line in lines:
-            line = line.rstrip()
-            if line or (cleaned_lines and not cleaned_lines[-1]):
-                cleaned_lines.append(line)
-
-        if len(cleaned_lines) != len(lines):
-            fixes_applied.append("Cleaned excessive whitespace")
-
-        mermaid_code = "\n".join(cleaned_lines)
-
-        # Edge Case 8: Invalid arrow syntax
-        # NOTE: Do NOT add --> after | in edge labels (-->|"label"| is correct, NOT -->|"label"|-->)
-        arrow_fixes = {
-            r"-->\s*\|": ("-->|", "Fixed arrow syntax (space before pipe)"),
-            # REMOVED: r"\|(?![-=])": ("|-->", "Fixed incomplete arrow"),  # This breaks edge labels!
-        }
-
-        for pattern, (replacement, description) in arrow_fixes.items():
-            if re.search(pattern, mermaid_code):
-                mermaid_code = re.sub(pattern, replacement, mermaid_code)
-                fixes_applied.append(description)
-
-        # Log fixes if any were applied
+        # Log fixes if any were applied (already de-duplicated)
         if fixes_applied:
             self.logger.info(
-                f"Applied {len(set(fixes_applied))} automatic fixes to Mermaid diagram"
+                f"Applied {len(fixes_applied)} automatic fixes to Mermaid diagram"
             )
-            for fix in set(fixes_applied):  # Use set to avoid duplicate messages
-                self.logger.debug(f"  - {fix}")
+            for fix in fixes_applied:
+                self.logger.debug("  - %s", fix)
         else:
             self.logger.debug("No sanitization needed for Mermaid diagram")
 
@@ -764,31 +1211,25 @@ class DocumentBuilder:
             )
 
             # Check if newlines are inside quoted labels (various formats)
-            remaining_in_brackets = re.findall(
-                r'\["[^\]]*\n[^\]]*"\]', mermaid_code, re.DOTALL
-            )
-            remaining_in_parens = re.findall(
-                r'\("[^)]*\n[^)]*"\)', mermaid_code, re.DOTALL
-            )
-            remaining_in_edges = re.findall(
-                r'\|"[^"]*\n[^"]*"\|', mermaid_code, re.DOTALL
-            )
+            remaining_in_brackets = _REMAIN_BRACKET_RE.findall(mermaid_code)
+            remaining_in_parens = _REMAIN_PAREN_RE.findall(mermaid_code)
+            remaining_in_edges = _REMAIN_EDGE_RE.findall(mermaid_code)
 
             if remaining_in_brackets:
                 self.logger.warning(
                     f"WARNING: {len(remaining_in_brackets)} bracket labels still contain newlines!"
                 )
-                self.logger.debug(f"Examples: {remaining_in_brackets[:2]}")
+                self.logger.debug("Examples: %s", remaining_in_brackets[:2])
             if remaining_in_parens:
                 self.logger.warning(
                     f"WARNING: {len(remaining_in_parens)} paren labels still contain newlines!"
                 )
-                self.logger.debug(f"Examples: {remaining_in_parens[:2]}")
+                self.logger.debug("Examples: %s", remaining_in_parens[:2])
             if remaining_in_edges:
                 self.logger.warning(
                     f"WARNING: {len(remaining_in_edges)} edge labels still contain newlines!"
                 )
-                self.logger.debug(f"Examples: {remaining_in_edges[:2]}")
+                self.logger.debug("Examples: %s", remaining_in_edges[:2])
 
         return mermaid_code, fixes_applied
 
@@ -815,9 +1256,9 @@ class DocumentBuilder:
 
             # Replace complex labels with simple generic ones
             # Keep the structure but simplify labels
-            line = re.sub(r'\["[^"]*"\]', f"[Node]", line)
-            line = re.sub(r'\("[^"]*"\)', f"(Node)", line)
-            line = re.sub(r"\{[^}]*\}", f"{{Node}}", line)
+            line = _SIMPLIFY_BRACKET_RE.sub("[Node]", line)
+            line = _SIMPLIFY_PAREN_RE.sub("(Node)", line)
+            line = _SIMPLIFY_BRACE_RE.sub("{Node}", line)
 
             simplified.append(line)
 
@@ -854,7 +1295,7 @@ class DocumentBuilder:
 
                 # Show console warnings if fixes were applied and warnings are enabled
                 if fixes_applied and mermaid_config.get("show_fix_warnings", True):
-                    unique_fixes = list(set(fixes_applied))  # Remove duplicates
+                    unique_fixes = fixes_applied  # Already de-duplicated
                     print(
                         f"\n⚠️  Auto-fixed Mermaid diagram ({len(unique_fixes)} fix{'es' if len(unique_fixes) != 1 else ''}):"
                     )
@@ -864,23 +1305,42 @@ class DocumentBuilder:
 
                 mermaid_code = sanitized_code
 
-            # Create temp file for Mermaid code
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".mmd", delete=False, encoding="utf-8"
-            ) as mmd_file:
-                mmd_file.write(mermaid_code)
-                mmd_path = mmd_file.name
+            # Rendered-diagram cache: identical sanitized source and render
+            # settings reuse the PNG from a previous run or document
+            render_settings = {
+                "background": mermaid_config.get("background", "white"),
+                "theme": mermaid_config.get("theme", "default"),
+                "curve": mermaid_config.get("flow_curve", "basis"),
+                "viewport_width": mermaid_config.get("viewport_width", 1200),
+                "viewport_height": mermaid_config.get("viewport_height", 800),
+            }
+            cache_key = hashlib.sha256(
+                (
+                    mermaid_code + json.dumps(render_settings, sort_keys=True)
+                ).encode("utf-8")
+            ).hexdigest()
+            cache_file = self._mermaid_cache_dir / f"{cache_key}.png"
+            if cache_file.exists():
+                self.logger.info("Mermaid render cache hit: %s", cache_key[:12])
+                return str(cache_file)
+
+            # Create temp file for Mermaid code; mkstemp + os.write skips
+            # the TextIOWrapper setup NamedTemporaryFile would build for a
+            # single one-shot write
+            fd, mmd_path = tempfile.mkstemp(suffix=".mmd")
+            os.write(fd, mermaid_code.encode("utf-8"))
+            os.close(fd)
 
             png_path = mmd_path.replace(".mmd", ".png")
 
             self.logger.info(f"Rendering Mermaid diagram to {png_path}")
-            self.logger.debug(f"Mermaid code length: {len(mermaid_code)} characters")
+            self.logger.debug("Mermaid code length: %s characters", len(mermaid_code))
 
             # Show progress indicator
             print("   🔄 Rendering diagram...", end="", flush=True)
 
             # Render using local Chromium via Playwright
-            render_mermaid_file_sync(
+            _render_mermaid_file(
                 input_file=mmd_path,
                 output_file=png_path,
                 output_format="png",
@@ -905,9 +1365,18 @@ class DocumentBuilder:
                 )
 
             self.logger.info(f"Successfully rendered Mermaid diagram")
+
+            try:
+                self._mermaid_cache_dir.mkdir(exist_ok=True)
+                cache_file.write_bytes(Path(png_path).read_bytes())
+                self.logger.debug("Cached Mermaid render: %s", cache_file.name)
+            except Exception as e:
+                self.logger.warning(f"Could not write Mermaid render cache: {e}")
+
             return png_path
 
         except ImportError as e:
+            self._render_degraded = True
             self.logger.error(
                 f"mermaid-cli not installed. Run: pip install mermaid-cli && playwright install chromium"
             )
@@ -917,6 +1386,7 @@ class DocumentBuilder:
             raise
 
         except Exception as e:
+            self._render_degraded = True
             print(" ✗", flush=True)  # Clear progress indicator
 
             # Extract the actual error message
@@ -932,11 +1402,20 @@ class DocumentBuilder:
                 error_summary = error_msg[:80]
 
             self.logger.warning(f"Failed to render Mermaid diagram: {error_summary}")
-            self.logger.debug(f"Full error: {e}")
-            self.logger.debug(f"Mermaid code that failed:\n{mermaid_code[:500]}...")
-
-            # Try simplified rendering if enabled
-            if mermaid_config.get("fallback_to_simplified", True):
+            self.logger.debug("Full error: %s", e)
+            self.logger.debug("Mermaid code that failed:\n%s...", mermaid_code[:500])
+
+            # Try simplified rendering if enabled, but only for label/parse
+            # failures -- environment errors would just burn another
+            # browser launch failing identically
+            recoverable = any(
+                p in error_msg for p in _RECOVERABLE_MERMAID_ERRORS
+            )
+            if not recoverable:
+                self.logger.debug(
+                    "Skipping simplified re-render: error not label/parse related"
+                )
+            if recoverable and mermaid_config.get("fallback_to_simplified", True):
                 try:
                     # Check if we should auto-accept simplified rendering
                     # Get values directly from config to ensure we have the latest settings
@@ -996,20 +1475,17 @@ class DocumentBuilder:
                     simplified_mmd_path = None
                     simplified_png_path = None
                     try:
-                        with tempfile.NamedTemporaryFile(
-                            mode="w",
-                            suffix="_simplified.mmd",
-                            delete=False,
-                            encoding="utf-8",
-                        ) as simplified_mmd:
-                            simplified_mmd.write(simplified_code)
-                            simplified_mmd_path = simplified_mmd.name
+                        fd, simplified_mmd_path = tempfile.mkstemp(
+                            suffix="_simplified.mmd"
+                        )
+                        os.write(fd, simplified_code.encode("utf-8"))
+                        os.close(fd)
 
                         simplified_png_path = simplified_mmd_path.replace(
                             ".mmd", ".png"
                         )
 
-                        render_mermaid_file_sync(
+                        _render_mermaid_file(
                             input_file=simplified_mmd_path,
                             output_file=simplified_png_path,
                             output_format="png",
@@ -1037,29 +1513,14 @@ class DocumentBuilder:
 
                             # DON'T delete the PNG - it's needed by ReportLab!
                             # Only clean up the .mmd file
-                            if (
-                                simplified_mmd_path
-                                and Path(simplified_mmd_path).exists()
-                            ):
-                                try:
-                                    Path(simplified_mmd_path).unlink()
-                                except Exception:
-                                    pass
+                            _quiet_unlink(simplified_mmd_path)
 
                             return simplified_png_path
 
                     except Exception as e3:
                         # Clean up on error
-                        if simplified_mmd_path and Path(simplified_mmd_path).exists():
-                            try:
-                                Path(simplified_mmd_path).unlink()
-                            except Exception:
-                                pass
-                        if simplified_png_path and Path(simplified_png_path).exists():
-                            try:
-                                Path(simplified_png_path).unlink()
-                            except Exception:
-                                pass
+                        _quiet_unlink(simplified_mmd_path)
+                        _quiet_unlink(simplified_png_path)
                         raise e3
 
                 except Exception as e2:
@@ -1079,12 +1540,271 @@ class DocumentBuilder:
 
         finally:
             # Always clean up input file
-            if mmd_path and Path(mmd_path).exists():
-                try:
-                    Path(mmd_path).unlink()
-                    self.logger.debug(f"Cleaned up temp file: {mmd_path}")
-                except Exception as e:
-                    self.logger.warning(f"Failed to cleanup temp file {mmd_path}: {e}")
+            if _quiet_unlink(mmd_path):
+                self.logger.debug("Cleaned up temp file: %s", mmd_path)
+
+    def _convert_markdown(self, content: str) -> str:
+        """Convert markdown to HTML with content-hash caching.
+
+        The cache key covers both the raw markdown and the extension
+        configuration, so config changes invalidate old entries. Results are
+        kept in memory for the current run and mirrored to a disk cache under
+        the output directory so unchanged documents skip the parse entirely.
+        """
+        key = hashlib.sha256(
+            content.encode("utf-8")
+            + json.dumps(MD_EXTENSION_CONFIGS, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        # In-memory hit: repeated builds within one run skip disk I/O entirely
+        if key in self._html_cache:
+            self.logger.debug("Markdown HTML cache hit (memory): %s", key[:12])
+            return self._html_cache[key]
+
+        # Disk hit: unchanged document from a previous run
+        cache_file = self._md_cache_dir / f"{key}.html"
+        if cache_file.exists():
+            self.logger.debug("Markdown HTML cache hit (disk): %s", key[:12])
+            html = cache_file.read_text(encoding="utf-8")
+            self._html_cache[key] = html
+            return html
+
+        self._md.reset()
+        html = self._md.convert(content)
+
+        try:
+            self._md_cache_dir.mkdir(exist_ok=True)
+            cache_file.write_text(html, encoding="utf-8")
+            self.logger.debug("Cached markdown HTML: %s", cache_file.name)
+        except Exception as e:
+            self.logger.warning(f"Could not write markdown HTML cache: {e}")
+
+        self._html_cache[key] = html
+        return html
+
+    def _append_code_block(self, story: List, code_text: str):
+        """Append a code block to the story as chunked Preformatted flowables.
+
+        Long blocks are split into fixed-size line chunks wrapped in
+        KeepTogether, which keeps ReportLab's splitter working on small
+        atomic units during repagination.
+        """
+        lines = code_text.split("\n")
+        for i in range(0, len(lines), _CODE_CHUNK_LINES):
+            chunk = "\n".join(lines[i : i + _CODE_CHUNK_LINES])
+            story.append(
+                KeepTogether([Preformatted(chunk, self.styles["CustomCode"])])
+            )
+        story.append(Spacer(1, 0.1 * inch))
+
+    def _emit_heading(self, element: Tag, story: List):
+        """Emit an h1/h2/h3 heading with its TOC bookmark."""
+        style, level, space_after = self._heading_specs[element.name]
+        para = self._create_heading_with_bookmark(element.get_text(), style, level)
+        story.extend((para, Spacer(1, space_after)))
+
+    def _emit_paragraph(self, element: Tag, story: List):
+        """Emit a <p> element as one or more styled Paragraphs."""
+        # One subtree walk instead of separate find("img") and
+        # find("code") traversals
+        has_img = False
+        has_code = False
+        for child in element.descendants:
+            if isinstance(child, Tag):
+                if child.name == "img":
+                    has_img = True
+                    break
+                if child.name == "code":
+                    has_code = True
+
+        # Skip paragraphs containing images
+        if has_img:
+            return
+
+        # Check for code elements
+        if has_code:
+            # Substitute on the serialized string so <code> spans nested
+            # inside other inline tags (e.g. **bold `x`**) are styled too
+            para_text = _clean_paragraph_html(element.decode_contents())
+            combined_text, code_count = _INLINE_CODE_RE.subn(
+                r'<font name="Courier-Bold" size="10" color="#00c853">\1</font>',
+                para_text,
+            )
+
+            # Use left alignment if multiple code elements
+            if code_count >= 2:
+                story.append(
+                    Paragraph(combined_text, self.styles["CustomBodyLeft"])
+                )
+            else:
+                story.append(Paragraph(combined_text, self.styles["CustomBody"]))
+        else:
+            # Serialize only the inner HTML: the <p> wrapper (and any id/
+            # class attributes on it) never reaches the string, so the
+            # cleanup pass usually short-circuits
+            para_text = element.decode_contents()
+
+            # Strip problematic attributes and unwrap footnote references
+            para_text = _clean_paragraph_html(para_text)
+
+            # Check paragraph length for justification
+            if len(para_text) < 150:
+                story.append(Paragraph(para_text, self.styles["CustomBodyLeft"]))
+            else:
+                story.append(Paragraph(para_text, self.styles["CustomBody"]))
+
+    def _emit_pre(self, element: Tag, story: List):
+        """Emit a <pre> element - Mermaid diagram or plain code block."""
+        # Code block processing - check for Mermaid diagrams first
+        code_elem = element.find("code")
+
+        if code_elem:
+            # Check if this is a Mermaid diagram; documents that never
+            # mention mermaid skip the per-block class inspection
+            is_mermaid = False
+            if self._has_mermaid:
+                classes = code_elem.get("class") or []
+                is_mermaid = any(
+                    "mermaid" in str(c).lower()
+                    for c in (classes if isinstance(classes, list) else [classes])
+                )
+
+            # Get Mermaid config
+            mermaid_config = self.config.get("mermaid", {})
+
+            if is_mermaid and mermaid_config.get("enabled", True):
+                # Extract Mermaid code
+                mermaid_code = code_elem.get_text().strip()
+                self.logger.info(
+                    f"Detected Mermaid diagram ({len(mermaid_code)} chars)"
+                )
+
+                # Try to render Mermaid diagram (joining the prefetched
+                # render when one is in flight)
+                prefetched = self._mermaid_prefetch.pop(mermaid_code, None)
+                if prefetched is not None:
+                    img_path = prefetched.result()
+                else:
+                    img_path = self._render_mermaid_diagram(mermaid_code)
+
+                if img_path:
+                    try:
+                        # Read dimensions from the PNG header
+                        img_width, img_height = _png_size(img_path)
+
+                        # Usable page area, precomputed in __init__
+                        page_width = self._page_width
+                        page_height = self._page_height
+
+                        max_width_percent = mermaid_config.get(
+                            "max_width_percent", 95
+                        )
+                        max_width = page_width * (max_width_percent / 100)
+
+                        # Calculate scaled dimensions maintaining aspect ratio
+                        aspect_ratio = img_height / img_width
+
+                        # Start with width-based scaling
+                        if img_width > max_width:
+                            scaled_width = max_width
+                            scaled_height = max_width * aspect_ratio
+                        else:
+                            # Convert pixels to points (assuming 72 DPI)
+                            scaled_width = img_width * 0.75
+                            scaled_height = img_height * 0.75
+
+                        # Check if height exceeds page height and scale down further if needed
+                        if scaled_height > page_height:
+                            scale_factor = page_height / scaled_height
+                            scaled_height = page_height
+                            scaled_width = scaled_width * scale_factor
+                            self.logger.debug(
+                                f"Scaled diagram down to fit page height: {scaled_width:.0f}x{scaled_height:.0f}"
+                            )
+
+                        # Create ReportLab image
+                        rl_img = RLImage(
+                            img_path,
+                            width=scaled_width,
+                            height=scaled_height,
+                        )
+
+                        # Add to story with spacing
+                        story.extend(
+                            (Spacer(1, 0.1 * inch), rl_img, Spacer(1, 0.2 * inch))
+                        )
+
+                        self.logger.info(
+                            f"Added Mermaid diagram: {scaled_width:.0f}x{scaled_height:.0f} points"
+                        )
+
+                        # Track temp file for cleanup after PDF is built
+                        # (cache hits live in the cache dir and are kept)
+                        if not img_path.startswith(str(self._mermaid_cache_dir)):
+                            self.temp_files.append(img_path)
+                        self.logger.debug(
+                            f"Tracking temp image for later cleanup: {img_path}"
+                        )
+
+                        # Skip regular code block processing
+                        return
+
+                    except Exception as e:
+                        self.logger.error(f"Failed to insert Mermaid image: {e}")
+                        # Fall through to regular code block processing
+                else:
+                    # Rendering failed, fall through to show as code block
+                    self.logger.warning(
+                        "Mermaid rendering failed, displaying as code block"
+                    )
+
+        # Regular code block processing (or Mermaid fallback);
+        # walk the subtree once via whichever element applies
+        code_text = (code_elem or element).get_text().strip()
+
+        if code_text:
+            self._append_code_block(story, code_text)
+
+    def _emit_blockquote(self, element: Tag, story: List):
+        """Emit a <blockquote> element."""
+        quote_text = element.get_text()
+        story.extend(
+            (
+                Paragraph(quote_text, self.styles["CustomQuote"]),
+                Spacer(1, 0.1 * inch),
+            )
+        )
+
+    def _emit_list(self, element: Tag, story: List):
+        """Emit a <ul>/<ol> element as a single ListFlowable."""
+        # ListFlowable batches list rendering instead of one
+        # bullet-prefixed Paragraph flowable per item
+        items = [
+            ListItem(Paragraph(li.get_text(), self.styles["CustomBody"]))
+            for li in element.find_all("li", recursive=False)
+        ]
+        if items:
+            story.append(
+                ListFlowable(
+                    items,
+                    bulletType="bullet" if element.name == "ul" else "1",
+                )
+            )
+        story.append(Spacer(1, 0.1 * inch))
+
+    def _emit_table(self, element: Tag, story: List):
+        """Emit a <table> element as a styled ReportLab Table."""
+        table_data = []
+        for row in element.find_all("tr"):
+            row_data = []
+            for cell in row.find_all(["th", "td"]):
+                row_data.append(cell.get_text())
+            table_data.append(row_data)
+
+        if table_data:
+            t = Table(table_data)
+            t.setStyle(_TABLE_STYLE)
+            story.extend((t, Spacer(1, 0.2 * inch)))
 
     def _process_markdown_to_story(
         self, content: str, toc: Optional[TableOfContents] = None
@@ -1092,49 +1812,76 @@ class DocumentBuilder:
         """Process markdown content and convert to ReportLab story elements."""
         self.logger.info("Processing markdown content to story elements")
 
-        # Convert markdown to HTML
-        md = markdown.Markdown(
-            extensions=[
-                "tables",
-                "fenced_code",
-                "footnotes",
-                "attr_list",
-                "def_list",
-                "abbr",
-                "toc",
-                "nl2br",
-                "sane_lists",
-                "codehilite",
-                "meta",
-            ],
-            extension_configs={
-                "codehilite": {
-                    "css_class": "highlight",
-                    "linenums": False,
-                    "guess_lang": True,
-                },
-                "fenced_code": {"lang_prefix": "language-"},
-                "toc": {"permalink": False, "baselevel": 1},
-            },
-        )
+        # Convert markdown to HTML (cached by content hash)
+        html = self._convert_markdown(content)
 
-        html = md.convert(content)
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self._soup_cache.pop(html, None)
+        if soup is None:
+            soup = BeautifulSoup(html, HTML_PARSER)
+        else:
+            self.logger.debug("Parsed HTML tree cache hit")
+        # Re-insert (LRU order = dict insertion order) and evict the
+        # least recently used tree beyond the cap
+        self._soup_cache[html] = soup
+        while len(self._soup_cache) > _SOUP_CACHE_MAX_ENTRIES:
+            self._soup_cache.pop(next(iter(self._soup_cache)))
+
+        # lxml wraps fragments in <html><body>; walk the body's children so
+        # element iteration matches the html.parser behavior
+        root = soup.body if soup.body is not None else soup
 
         story = []
 
+        # Start rendering every Mermaid diagram in the document before the
+        # story walk: each render spawns its own headless-browser process,
+        # so overlapping them hides N-1 of the startup latencies. _emit_pre
+        # joins the matching future when the walk reaches each block
+        self._mermaid_prefetch = {}
+        self._has_mermaid = "mermaid" in content
+        if self._has_mermaid and self.config.get("mermaid", {}).get(
+            "enabled", True
+        ):
+            codes = []
+            for code_elem in soup.find_all("code"):
+                parent = code_elem.parent
+                if parent is None or parent.name != "pre":
+                    continue
+                classes = code_elem.get("class") or []
+                if any(
+                    "mermaid" in str(c).lower()
+                    for c in (classes if isinstance(classes, list) else [classes])
+                ):
+                    codes.append(code_elem.get_text().strip())
+            if len(codes) > 1:
+                self.logger.info(
+                    "Prefetching %s Mermaid diagram renders", len(codes)
+                )
+                render_pool = ThreadPoolExecutor(
+                    max_workers=min(len(codes), os.cpu_count() or 1)
+                )
+                for code in codes:
+                    if code not in self._mermaid_prefetch:
+                        self._mermaid_prefetch[code] = render_pool.submit(
+                            self._render_mermaid_diagram, code
+                        )
+                render_pool.shutdown(wait=False)
+
         # Check if document has any headings
         headings = soup.find_all(["h1", "h2", "h3"])
         has_headings = bool(headings)
-        self.logger.debug(f"Document has {len(headings)} headings")
+        self.logger.debug("Document has %s headings", len(headings))
 
         # If headings exist and TOC provided, add it
         if has_headings and toc:
             self.logger.info("Adding Table of Contents to document")
-            story.append(Paragraph("Table of Contents", self.styles["TOCHeading"]))
-            story.append(Spacer(1, 12))
-            story.append(toc)
-            story.append(PageBreak())
+            story.extend(
+                (
+                    Paragraph("Table of Contents", self.styles["TOCHeading"]),
+                    Spacer(1, 12),
+                    toc,
+                    PageBreak(),
+                )
+            )
 
             self._has_toc_section = True
             self._skip_manual_toc = True
@@ -1142,16 +1889,38 @@ class DocumentBuilder:
             self._has_toc_section = False
             self._skip_manual_toc = False
 
-        # Process HTML elements
+        # Process HTML elements. The manual-TOC detection branches only
+        # matter when a generated TOC exists, so dispatch through a loop
+        # specialized for each case
+        if self._has_toc_section:
+            self._process_elements_with_toc(root, story)
+        else:
+            self._process_elements_plain(root, story)
+
+        self.logger.info(f"Generated {len(story)} story elements")
+        return story
+
+    def _process_elements_plain(self, root, story: List):
+        """Dispatch top-level elements with no manual-TOC bookkeeping."""
+        handlers = self._tag_handlers
+        for element in root.children:
+            if isinstance(element, Tag):
+                handler = handlers.get(element.name)
+                if handler is not None:
+                    handler(element, story)
+
+    def _process_elements_with_toc(self, root, story: List):
+        """Dispatch top-level elements, skipping any manual TOC section."""
+        handlers = self._tag_handlers
         skip_manual_toc_section = False
 
-        for element in soup.children:
+        for element in root.children:
             if isinstance(element, Tag):
                 # Check if this is a manual TOC section to skip
                 if element.name in ["h1", "h2", "h3"]:
                     text = element.get_text().lower()
                     # Start skipping if we encounter a "table of contents" heading
-                    if "table of contents" in text and self._has_toc_section:
+                    if "table of contents" in text:
                         skip_manual_toc_section = True
                         continue
                     # Stop skipping once we hit the next major section
@@ -1163,320 +1932,34 @@ class DocumentBuilder:
                 if skip_manual_toc_section and element.name in ["ol", "ul"]:
                     continue
 
-                # Process headings with TOC support
-                if element.name == "h1":
-                    text = element.get_text()
-                    para = self._create_heading_with_bookmark(
-                        text, self.styles["CustomHeading1"], 0
-                    )
-                    story.append(para)
-                    story.append(Spacer(1, 0.2 * inch))
-
-                elif element.name == "h2":
-                    text = element.get_text()
-                    para = self._create_heading_with_bookmark(
-                        text, self.styles["CustomHeading2"], 1
-                    )
-                    story.append(para)
-                    story.append(Spacer(1, 0.15 * inch))
-
-                elif element.name == "h3":
-                    text = element.get_text()
-                    para = self._create_heading_with_bookmark(
-                        text, self.styles["CustomHeading3"], 2
-                    )
-                    story.append(para)
-                    story.append(Spacer(1, 0.1 * inch))
-
-                elif element.name == "p":
-                    # Skip paragraphs containing images
-                    if element.find("img"):
-                        continue
-
-                    # Get paragraph text and clean HTML attributes
-                    para_text = str(element)
-
-                    # Remove problematic attributes
-                    para_text = re.sub(r'\s*id="[^"]*"', "", para_text)
-                    para_text = re.sub(r'\s*class="[^"]*"', "", para_text)
-
-                    # Convert footnote references
-                    para_text = re.sub(
-                        r"<sup[^>]*><a[^>]*>(\d+)</a></sup>",
-                        r"<sup>\1</sup>",
-                        para_text,
-                    )
-
-                    # Check for code elements
-                    if element.find("code"):
-                        para_parts = []
-                        parts = re.split(r"(<code>.*?</code>)", para_text)
-                        code_count = 0
-                        for part in parts:
-                            if part.startswith("<code>") and part.endswith("</code>"):
-                                code_count += 1
-                                code_content = part[6:-7]
-                                para_parts.append(
-                                    f'<font name="Courier-Bold" size="10" color="#00c853">{code_content}</font>'
-                                )
-                            elif part:
-                                para_parts.append(part)
-
-                        combined_text = "".join(para_parts)
-
-                        # Use left alignment if multiple code elements
-                        if code_count >= 2:
-                            left_style = ParagraphStyle(
-                                "TempLeft",
-                                parent=self.styles["CustomBody"],
-                                alignment=TA_LEFT,
-                            )
-                            story.append(Paragraph(combined_text, left_style))
-                        else:
-                            story.append(
-                                Paragraph(combined_text, self.styles["CustomBody"])
-                            )
-                    else:
-                        # Check paragraph length for justification
-                        if len(para_text) < 150:
-                            left_style = ParagraphStyle(
-                                "TempLeft",
-                                parent=self.styles["CustomBody"],
-                                alignment=TA_LEFT,
-                            )
-                            story.append(Paragraph(para_text, left_style))
-                        else:
-                            story.append(
-                                Paragraph(para_text, self.styles["CustomBody"])
-                            )
-
-                elif element.name == "pre":
-                    # Code block processing - check for Mermaid diagrams first
-                    code_elem = element.find("code")
-
-                    if code_elem:
-                        # Check if this is a Mermaid diagram
-                        classes = code_elem.get("class") or []
-                        is_mermaid = any(
-                            "mermaid" in str(c).lower()
-                            for c in (
-                                classes if isinstance(classes, list) else [classes]
-                            )
-                        )
-
-                        # Get Mermaid config
-                        mermaid_config = self.config.get("mermaid", {})
-
-                        if is_mermaid and mermaid_config.get("enabled", True):
-                            # Extract Mermaid code
-                            mermaid_code = code_elem.get_text().strip()
-                            self.logger.info(
-                                f"Detected Mermaid diagram ({len(mermaid_code)} chars)"
-                            )
-
-                            # Try to render Mermaid diagram
-                            img_path = self._render_mermaid_diagram(mermaid_code)
-
-                            if img_path:
-                                try:
-                                    # Open image to get dimensions
-                                    img = Image.open(img_path)
-                                    img_width, img_height = img.size
-
-                                    # Calculate scaling to fit page width (with margins)
-                                    page_width = (
-                                        A4[0]
-                                        - (
-                                            self.config["margins"]["left"]
-                                            + self.config["margins"]["right"]
-                                        )
-                                        * mm
-                                    )
-
-                                    # Calculate available height (accounting for margins and spacing)
-                                    page_height = (
-                                        A4[1]
-                                        - (
-                                            self.config["margins"]["top"]
-                                            + self.config["margins"]["bottom"]
-                                        )
-                                        * mm
-                                        - 72  # Reserve space for header/footer (1 inch)
-                                    )
-
-                                    max_width_percent = mermaid_config.get(
-                                        "max_width_percent", 95
-                                    )
-                                    max_width = page_width * (max_width_percent / 100)
-
-                                    # Calculate scaled dimensions maintaining aspect ratio
-                                    aspect_ratio = img_height / img_width
-
-                                    # Start with width-based scaling
-                                    if img_width > max_width:
-                                        scaled_width = max_width
-                                        scaled_height = max_width * aspect_ratio
-                                    else:
-                                        # Convert pixels to points (assuming 72 DPI)
-                                        scaled_width = img_width * 0.75
-                                        scaled_height = img_height * 0.75
-
-                                    # Check if height exceeds page height and scale down further if needed
-                                    if scaled_height > page_height:
-                                        scale_factor = page_height / scaled_height
-                                        scaled_height = page_height
-                                        scaled_width = scaled_width * scale_factor
-                                        self.logger.debug(
-                                            f"Scaled diagram down to fit page height: {scaled_width:.0f}x{scaled_height:.0f}"
-                                        )
-
-                                    # Create ReportLab image
-                                    rl_img = RLImage(
-                                        img_path,
-                                        width=scaled_width,
-                                        height=scaled_height,
-                                    )
-
-                                    # Add to story with spacing
-                                    story.append(Spacer(1, 0.1 * inch))
-                                    story.append(rl_img)
-                                    story.append(Spacer(1, 0.2 * inch))
-
-                                    self.logger.info(
-                                        f"Added Mermaid diagram: {scaled_width:.0f}x{scaled_height:.0f} points"
-                                    )
-
-                                    # Track temp file for cleanup after PDF is built
-                                    self.temp_files.append(img_path)
-                                    self.logger.debug(
-                                        f"Tracking temp image for later cleanup: {img_path}"
-                                    )
-
-                                    # Skip regular code block processing
-                                    continue
-
-                                except Exception as e:
-                                    self.logger.error(
-                                        f"Failed to insert Mermaid image: {e}"
-                                    )
-                                    # Fall through to regular code block processing
-                            else:
-                                # Rendering failed, fall through to show as code block
-                                self.logger.warning(
-                                    "Mermaid rendering failed, displaying as code block"
-                                )
-
-                    # Regular code block processing (or Mermaid fallback)
-                    code_text = element.get_text().strip()
-
-                    if code_elem:
-                        code_text = code_elem.get_text().strip()
-
-                    # Process code lines
-                    lines = code_text.split("\n")
-                    code_lines = []
-                    for line in lines:
-                        if line.strip():
-                            line = line.replace("&", "&amp;")
-                            line = line.replace("<", "&lt;")
-                            line = line.replace(">", "&gt;")
-                            code_lines.append(line)
-                        else:
-                            code_lines.append("")
-
-                    if code_lines:
-                        code_content = "<br/>".join(code_lines)
-                        story.append(Paragraph(code_content, self.styles["CustomCode"]))
-                        story.append(Spacer(1, 0.1 * inch))
-
-                elif element.name == "div" and "highlight" in (
-                    element.get("class") or []
-                ):
-                    # Handle highlighted code blocks
-                    code_elem = element.find("pre")
-                    if code_elem:
-                        code_text = code_elem.get_text().strip()
-                        lines = code_text.split("\n")
-                        code_lines = []
-                        for line in lines:
-                            if line.strip():
-                                line = line.replace("&", "&amp;")
-                                line = line.replace("<", "&lt;")
-                                line = line.replace(">", "&gt;")
-                                code_lines.append(line)
-                            else:
-                                code_lines.append("")
-
-                        if code_lines:
-                            code_content = "<br/>".join(code_lines)
-                            story.append(
-                                Paragraph(code_content, self.styles["CustomCode"])
-                            )
-                            story.append(Spacer(1, 0.1 * inch))
-
-                elif element.name == "blockquote":
-                    quote_text = element.get_text()
-                    story.append(Paragraph(quote_text, self.styles["CustomQuote"]))
-                    story.append(Spacer(1, 0.1 * inch))
-
-                elif element.name == "ul" or element.name == "ol":
-                    for idx, li in enumerate(
-                        element.find_all("li", recursive=False), 1
-                    ):
-                        bullet = "• " if element.name == "ul" else f"{idx}. "
-                        text = bullet + li.get_text()
-                        story.append(Paragraph(text, self.styles["CustomBody"]))
-                    story.append(Spacer(1, 0.1 * inch))
-
-                elif element.name == "table":
-                    # Process tables
-                    table_data = []
-                    for row in element.find_all("tr"):
-                        row_data = []
-                        for cell in row.find_all(["th", "td"]):
-                            row_data.append(cell.get_text())
-                        table_data.append(row_data)
-
-                    if table_data:
-                        t = Table(table_data)
-                        t.setStyle(
-                            TableStyle(
-                                [
-                                    (
-                                        "BACKGROUND",
-                                        (0, 0),
-                                        (-1, 0),
-                                        colors.HexColor("#f6f8fa"),
-                                    ),
-                                    (
-                                        "TEXTCOLOR",
-                                        (0, 0),
-                                        (-1, 0),
-                                        colors.HexColor("#1a1a1a"),
-                                    ),
-                                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                                    ("FONTSIZE", (0, 0), (-1, 0), 10),
-                                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                                    ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                                    (
-                                        "GRID",
-                                        (0, 0),
-                                        (-1, -1),
-                                        1,
-                                        colors.HexColor("#e1e4e8"),
-                                    ),
-                                    ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                                    ("FONTSIZE", (0, 1), (-1, -1), 9),
-                                    ("PADDING", (0, 0), (-1, -1), 6),
-                                ]
-                            )
-                        )
-                        story.append(t)
-                        story.append(Spacer(1, 0.2 * inch))
+                handler = handlers.get(element.name)
+                if handler is not None:
+                    handler(element, story)
+
+    def _process_plain_text_to_story(self, content: str) -> List:
+        """Convert plain text to story elements, one paragraph per blank line."""
+        self.logger.debug("Processing plain text document")
+        body_style = self.styles["CustomBody"]
+        # A Spacer carries no per-position state, so one instance can sit
+        # between every paragraph instead of allocating one per gap
+        spacer = Spacer(1, 0.1 * inch)
+        # One compiled split (tolerant of whitespace-only blank lines) and a
+        # single comprehension instead of per-paragraph append pairs
+        return [
+            flowable
+            for para in _PARA_SPLIT_RE.split(content)
+            if para.strip()
+            for flowable in (
+                Paragraph(para.replace("\n", "<br/>"), body_style),
+                spacer,
+            )
+        ]
 
-        self.logger.info(f"Generated {len(story)} story elements")
-        return story
+    def _make_numbered_canvas(self, toc, *args, **kwargs):
+        """Canvas factory for multiBuild: a NumberedCanvas wired to the TOC."""
+        canv = NumberedCanvas(*args, **kwargs)
+        canv.toc = toc  # type: ignore[attr-defined]
+        return canv
 
     def _create_cover_page(self, canvas_obj, doc, metadata: Dict[str, str]):
         """Create a cover page for the document."""
@@ -1491,17 +1974,14 @@ class DocumentBuilder:
         usable_width = width - (2 * margin)
 
         # Add logo if exists
-        logo_path = self.assets_dir / "GerdsenAI_Neural_G_Invoice.png"
         logo_bottom = height - 3.5 * inch
 
-        if logo_path.exists():
+        if self._logo_reader is not None:
             try:
-                img = Image.open(logo_path)
-                aspect = img.height / img.width
                 img_width = 2.5 * inch
-                img_height = img_width * aspect
+                img_height = img_width * self._logo_aspect
                 canvas_obj.drawImage(
-                    str(logo_path),
+                    self._logo_reader,
                     (width - img_width) / 2,
                     height - 2 * inch - img_height,
                     width=img_width,
@@ -1514,31 +1994,24 @@ class DocumentBuilder:
             except Exception as e:
                 self.logger.warning(f"Could not add logo: {e}")
 
-        # Title
+        # Title - try the largest font size that fits on a single measured
+        # line; only wrap (at the smallest size) when none fits
         title = metadata.get("title", "Untitled Document")
 
-        # Word wrap the title
-        import textwrap
-
-        title_font_size = 28
-        char_width = title_font_size * 0.6
-        max_chars = int(usable_width / char_width * 1.8)
-
-        lines = textwrap.wrap(title, width=max_chars, break_long_words=False)
-
-        # Check if we need smaller font
-        use_smaller_font = False
-        for line in lines:
-            test_width = canvas_obj.stringWidth(line, "Helvetica-Bold", title_font_size)
-            if test_width > usable_width:
-                use_smaller_font = True
+        for title_font_size in (28, 24, 20, 18):
+            if (
+                canvas_obj.stringWidth(title, "Helvetica-Bold", title_font_size)
+                <= usable_width
+            ):
+                lines = [title]
                 break
-
-        if use_smaller_font:
-            title_font_size = 24
+        else:
+            lines = simpleSplit(
+                title, "Helvetica-Bold", title_font_size, usable_width
+            )
 
         canvas_obj.setFont("Helvetica-Bold", title_font_size)
-        canvas_obj.setFillColor(colors.HexColor("#1a1a1a"))
+        canvas_obj.setFillColor(_COLOR_TEXT)
 
         # Draw title lines
         y_position = logo_bottom
@@ -1552,11 +2025,9 @@ class DocumentBuilder:
         if metadata.get("subtitle"):
             y_position -= 0.2 * inch
             canvas_obj.setFont("Helvetica", 16)
-            canvas_obj.setFillColor(colors.HexColor("#666666"))
-            subtitle_char_width = 16 * 0.5
-            subtitle_max_chars = int(usable_width / subtitle_char_width * 1.8)
-            subtitle_lines = textwrap.wrap(
-                metadata["subtitle"], width=subtitle_max_chars
+            canvas_obj.setFillColor(_COLOR_FOOTER)
+            subtitle_lines = simpleSplit(
+                metadata["subtitle"], "Helvetica", 16, usable_width
             )
             for line in subtitle_lines:
                 canvas_obj.drawCentredString(width / 2, y_position, line)
@@ -1564,11 +2035,13 @@ class DocumentBuilder:
 
         # Author
         canvas_obj.setFont("Helvetica-Bold", 14)
-        canvas_obj.setFillColor(colors.HexColor("#444444"))
+        canvas_obj.setFillColor(_COLOR_SUBTITLE)
         author_text = f"Prepared by {metadata.get('author', 'Unknown Author')}"
         author_width = canvas_obj.stringWidth(author_text, "Helvetica-Bold", 14)
         if author_width > usable_width:
-            author_lines = textwrap.wrap(author_text, width=int(usable_width / 14 * 2))
+            author_lines = simpleSplit(
+                author_text, "Helvetica-Bold", 14, usable_width
+            )
             y_pos = 3 * inch
             for line in author_lines:
                 canvas_obj.drawCentredString(width / 2, y_pos, line)
@@ -1578,7 +2051,7 @@ class DocumentBuilder:
 
         # Date
         canvas_obj.setFont("Helvetica", 11)
-        canvas_obj.setFillColor(colors.HexColor("#888888"))
+        canvas_obj.setFillColor(_COLOR_AUTHOR)
         canvas_obj.drawCentredString(
             width / 2,
             1.5 * inch,
@@ -1587,7 +2060,7 @@ class DocumentBuilder:
 
         # Version
         canvas_obj.setFont("Helvetica", 10)
-        canvas_obj.setFillColor(colors.HexColor("#aaaaaa"))
+        canvas_obj.setFillColor(_COLOR_DATE)
         canvas_obj.drawCentredString(
             width / 2, 1 * inch, f"Version {metadata.get('version', '1.0.0')}"
         )
@@ -1596,79 +2069,131 @@ class DocumentBuilder:
 
     def _add_page_number(self, canvas_obj, doc):
         """Add page numbers and headers to each page."""
+        # The cover page carries no header/footer; bail before touching
+        # graphics state so page 1 emits no unused q/Q pair
+        if doc.page == 1 and self._cover_enabled:
+            return
+
         canvas_obj.saveState()
 
-        # Skip header/footer on first page
-        if doc.page > 1:
-            width, height = A4
+        width, height = A4
 
-            # Header - document title
-            if hasattr(doc, "metadata"):
-                canvas_obj.setFont("Helvetica", 10)
-                canvas_obj.setFillColor(colors.HexColor("#666666"))
-                canvas_obj.drawCentredString(
-                    width / 2, height - 0.5 * inch, doc.metadata.get("title", "")
+        # Batch header and page number into one text object so each page
+        # emits a single text block instead of a state/draw pair per
+        # string; x offsets come from stringWidth to keep the centred/
+        # right alignment
+        text = canvas_obj.beginText()
+        text.setFillColor(_COLOR_FOOTER)
+
+        # Header - document title
+        if hasattr(doc, "metadata"):
+            title = doc.metadata.get("title", "")
+            if title:
+                text.setFont("Helvetica", 10)
+                title_width = pdfmetrics.stringWidth(title, "Helvetica", 10)
+                text.setTextOrigin(
+                    (width - title_width) / 2, height - 0.5 * inch
                 )
+                text.textOut(title)
 
-            # Footer - page number
-            canvas_obj.setFont("Helvetica", 9)
-            canvas_obj.setFillColor(colors.HexColor("#666666"))
-            canvas_obj.drawRightString(width - inch, 0.5 * inch, f"Page {doc.page - 1}")
+        # Footer - page number; only discount page 1 when it is a cover
+        page_number = doc.page - 1 if self._cover_enabled else doc.page
+        page_label = f"Page {page_number}"
+        text.setFont("Helvetica", 9)
+        label_width = pdfmetrics.stringWidth(page_label, "Helvetica", 9)
+        text.setTextOrigin(width - inch - label_width, 0.5 * inch)
+        text.textOut(page_label)
 
-            # Footer - logo
-            logo_path = self.assets_dir / "GerdsenAI_Neural_G_Invoice.png"
-            if logo_path.exists():
-                try:
-                    canvas_obj.drawImage(
-                        str(logo_path),
-                        width / 2 - 0.5 * inch,
-                        0.3 * inch,
-                        width=inch,
-                        height=0.4 * inch,
-                        preserveAspectRatio=True,
-                        mask="auto",
-                    )
-                except:
-                    pass
+        canvas_obj.drawText(text)
+
+        # Footer - logo, pre-fitted to its box at init time
+        if self._logo_reader is not None:
+            try:
+                off_x, off_y = self._footer_logo_offset
+                canvas_obj.drawImage(
+                    self._logo_reader,
+                    width / 2 - 0.5 * inch + off_x,
+                    0.3 * inch + off_y,
+                    width=self._footer_logo_size[0],
+                    height=self._footer_logo_size[1],
+                    mask="auto",
+                )
+            except:
+                pass
 
         canvas_obj.restoreState()
 
     def _resolve_input_path(self, input_file: str) -> Path:
-        """Resolve input file path with robust handling of different path formats."""
-        self.logger.debug(f"Resolving input path for: {input_file}")
+        """Resolve input file path with robust handling of different path formats.
+
+        Resolutions are cached per builder: rebuilding the same document
+        skips the exists/prefix probing (and its stat calls) entirely.
+        """
+        cached = self._resolved_paths.get(input_file)
+        if cached is not None:
+            return cached
+        resolved = self._resolve_input_path_uncached(input_file)
+        self._resolved_paths[input_file] = resolved
+        return resolved
+
+    def _resolve_input_path_uncached(self, input_file: str) -> Path:
+        self.logger.debug("Resolving input path for: %s", input_file)
 
         # Convert to Path object
         input_path = Path(input_file)
 
         # Case 1: Absolute path - use directly
         if input_path.is_absolute():
-            self.logger.debug(f"Using absolute path: {input_path}")
+            self.logger.debug("Using absolute path: %s", input_path)
             return input_path
 
         # Case 2: Relative path that exists as-is - use directly
         if input_path.exists():
-            self.logger.debug(f"Using existing relative path: {input_path}")
+            self.logger.debug("Using existing relative path: %s", input_path)
             return input_path.resolve()
 
         # Case 3: Path already includes To_Build/ - avoid double-prepending
-        if str(input_path).startswith("To_Build/") or str(input_path).startswith(
-            "TO_Build/"
-        ):
+        if str(input_path).startswith(("To_Build/", "TO_Build/")):
             # Remove the To_Build prefix and treat as bare filename
             parts = input_path.parts
             if len(parts) > 1:
                 filename = parts[-1]  # Get just the filename
                 resolved_path = self.to_build_dir / filename
-                self.logger.debug(f"Removed To_Build prefix, using: {resolved_path}")
+                self.logger.debug("Removed To_Build prefix, using: %s", resolved_path)
                 return resolved_path
 
         # Case 4: Bare filename - prepend To_Build directory
         resolved_path = self.to_build_dir / input_file
-        self.logger.debug(f"Using To_Build directory path: {resolved_path}")
+        self.logger.debug("Using To_Build directory path: %s", resolved_path)
         return resolved_path
 
-    def build_document(self, input_file: str, output_file: Optional[str] = None) -> str:
-        """Build a PDF document from input file."""
+    def _prune_pdf_cache(self) -> None:
+        """Drop the oldest finished-PDF cache entries beyond the cap.
+
+        Keys include the cover date, so yesterday's entries are dead
+        weight; trimming by mtime keeps the cache at one screenful of
+        recent builds.
+        """
+        with os.scandir(self._pdf_cache_dir) as entries:
+            cached = sorted(
+                (e for e in entries if e.is_file()),
+                key=lambda e: e.stat().st_mtime,
+            )
+        for stale in cached[:-_PDF_CACHE_MAX_ENTRIES]:
+            if _quiet_unlink(stale.path):
+                self.logger.debug("Pruned PDF cache entry: %s", stale.name)
+
+    def build_document(
+        self,
+        input_file: str,
+        output_file: Optional[str] = None,
+        content: Optional[str] = None,
+    ) -> str:
+        """Build a PDF document from input file.
+
+        If the caller already holds the file body (e.g. a prefetching batch
+        loop), it can pass it via ``content`` to skip the disk read.
+        """
         self.logger.info("=" * 60)
         self.logger.info(f"Building document: {input_file}")
 
@@ -1676,114 +2201,173 @@ class DocumentBuilder:
             # Robust input path resolution
             input_path = self._resolve_input_path(input_file)
 
-            if not input_path.exists():
+            # One stat call covers both the existence check and the size
+            # used to preallocate the read buffer
+            try:
+                input_stat = input_path.stat()
+            except OSError:
                 error_msg = f"Input file not found: {input_path}"
                 self.logger.error(error_msg)
-                raise FileNotFoundError(error_msg)
-
-            # Read content
-            self.logger.debug(f"Reading file: {input_path}")
-            with open(input_path, "r", encoding="utf-8") as f:
-                content = f.read()
+                raise FileNotFoundError(error_msg) from None
+
+            # Read content (unless the caller prefetched it)
+            if content is None:
+                self.logger.debug("Reading file: %s", input_path)
+                # Read raw bytes into a preallocated buffer and decode once,
+                # skipping the TextIOWrapper layer and its chunked
+                # incremental decode
+                buf = bytearray(input_stat.st_size)
+                with open(input_path, "rb") as f:
+                    n = f.readinto(buf)
+                del buf[n:]
+                content = buf.decode("utf-8")
 
             # Extract metadata
             content, metadata = self._extract_metadata(content)
             self.logger.info(f"Document title: {metadata.get('title', 'Untitled')}")
 
+            # One clock read serves both the output timestamp and the
+            # cover-page date default
+            now = datetime.now()
+            metadata.setdefault("date", now.strftime("%B %d, %Y"))
+
             # Generate output filename
             if output_file is None:
                 base_name = input_path.stem
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = now.strftime("%Y%m%d_%H%M%S")
                 prefix = self.config.get("filename_prefix", "")
                 output_file = f"{prefix}{base_name}_{timestamp}.pdf"
 
             output_path = self.output_dir / output_file
             self.logger.info(f"Output file: {output_path}")
 
+            # Content-addressed build cache: the PDF is a pure function of
+            # the body, the config, and the cover metadata (which carries
+            # the rendered date), so unchanged inputs skip ReportLab
+            # entirely and copy the cached bytes to the new output name
+            self._render_degraded = False
+            pdf_cache_key = hashlib.blake2b(
+                json.dumps(
+                    [content, metadata, self.config, self._logo_cache_key],
+                    sort_keys=True,
+                    default=str,
+                ).encode("utf-8")
+            ).hexdigest()
+            pdf_cache_file = self._pdf_cache_dir / f"{pdf_cache_key}.pdf"
+            if pdf_cache_file.exists():
+                shutil.copyfile(pdf_cache_file, output_path)
+                self.logger.info(
+                    "PDF build cache hit: %s", pdf_cache_key[:12]
+                )
+                self.logger.info(f"✅ Successfully generated PDF: {output_path}")
+                return str(output_path)
+
             # Reset heading counter for new document
             self.heading_counter = 0
 
+            # Classify the input once; markdown gets the TOC pipeline,
+            # everything else is plain text
+            is_markdown = input_path.suffix.lower() in _MARKDOWN_SUFFIXES
+
             # Create TOC for markdown files
             toc = None
-            suffix_lower = input_path.suffix.lower()
-            if suffix_lower in (".md", ".markdown"):
+            if is_markdown:
                 toc = self._create_toc()
                 self.logger.debug("Created TOC for markdown document")
 
-            # Create PDF document with custom template for TOC support
-            doc = TOCDocTemplate(
-                str(output_path),
-                pagesize=A4,
-                rightMargin=self.config["margins"]["right"] * mm,
-                leftMargin=self.config["margins"]["left"] * mm,
-                topMargin=self.config["margins"]["top"] * mm,
-                bottomMargin=self.config["margins"]["bottom"] * mm,
-                title=metadata.get("title", "Document"),
-                author=metadata.get("author", "Unknown"),
-                subject=metadata.get("subject", ""),
-                creator="GerdsenAI Document Builder",
-                toc=toc,  # Pass TOC to the document template
-            )
-
-            # Store metadata in doc
-            doc.metadata = metadata  # type: ignore[attr-defined]
-
             # Build story
             story = []
 
-            # Add cover page placeholder
-            story.append(PageBreak())
+            # Add cover page placeholder (unless the config opts out of
+            # covers entirely, e.g. for small utility documents)
+            cover_enabled = self.config.get("cover_page", True)
+            self._cover_enabled = cover_enabled
+            if cover_enabled:
+                story.append(PageBreak())
 
             # Process content
-            suffix_lower = input_path.suffix.lower()
-            if suffix_lower in (".md", ".markdown"):
-                content_story = self._process_markdown_to_story(content, toc)
-                story.extend(content_story)
+            self._has_toc_section = False
+            if is_markdown:
+                story.extend(self._process_markdown_to_story(content, toc))
             else:
-                # Plain text
-                self.logger.debug("Processing plain text document")
-                paragraphs = content.split("\n\n")
-                for para in paragraphs:
-                    if para.strip():
-                        story.append(
-                            Paragraph(
-                                para.replace("\n", "<br/>"), self.styles["CustomBody"]
-                            )
-                        )
-                        story.append(Spacer(1, 0.1 * inch))
-
-            # Build PDF with custom canvas for page tracking
-            def make_canvas(*args, **kwargs):
-                canv = NumberedCanvas(*args, **kwargs)
-                canv.toc = toc  # type: ignore[attr-defined]
-                return canv
-
-            # Page handlers
-            def on_every_page(canvas_obj, doc):
-                if doc.page == 1:
-                    self._create_cover_page(canvas_obj, doc, metadata)
-                else:
-                    self._add_page_number(canvas_obj, doc)
+                story.extend(self._process_plain_text_to_story(content))
+
+            # Build PDF with custom canvas for page tracking. Bind the
+            # per-document state with partials over stable methods instead
+            # of defining fresh closures (and code objects) per build
+            make_canvas = functools.partial(self._make_numbered_canvas, toc)
+            if cover_enabled:
+                on_first_page = functools.partial(
+                    self._create_cover_page, metadata=metadata
+                )
+            else:
+                # No cover: page 1 is ordinary content and gets the
+                # standard header/footer
+                on_first_page = self._add_page_number
 
-            # Build with custom canvas
+            # Build with custom canvas, streaming the PDF through one large
+            # buffered handle instead of ReportLab's default path writer
             self.logger.info("Building PDF...")
-            doc.multiBuild(
-                story,
-                canvasmaker=make_canvas,
-                onFirstPage=on_every_page,
-                onLaterPages=on_every_page,
-            )
+            with open(output_path, "wb", buffering=1024 * 1024) as pdf_file:
+                # Create PDF document with custom template for TOC support
+                doc = TOCDocTemplate(
+                    pdf_file,
+                    pagesize=A4,
+                    rightMargin=self.config["margins"]["right"] * mm,
+                    leftMargin=self.config["margins"]["left"] * mm,
+                    topMargin=self.config["margins"]["top"] * mm,
+                    bottomMargin=self.config["margins"]["bottom"] * mm,
+                    title=metadata.get("title", "Document"),
+                    author=metadata.get("author", "Unknown"),
+                    subject=metadata.get("subject", ""),
+                    creator="GerdsenAI Document Builder",
+                    pageCompression=1,
+                    toc=toc,  # Pass TOC to the document template
+                )
+
+                # Store metadata in doc
+                doc.metadata = metadata  # type: ignore[attr-defined]
+
+                if toc is not None and self._has_toc_section:
+                    doc.multiBuild(
+                        story,
+                        canvasmaker=make_canvas,
+                        onFirstPage=on_first_page,
+                        onLaterPages=self._add_page_number,
+                    )
+                else:
+                    # No TOC to resolve, so a single layout pass suffices
+                    doc.build(
+                        story,
+                        canvasmaker=make_canvas,
+                        onFirstPage=on_first_page,
+                        onLaterPages=self._add_page_number,
+                    )
 
             self.logger.info(f"✅ Successfully generated PDF: {output_path}")
 
-            # Clean up temporary files now that PDF is built
-            for temp_file in self.temp_files:
+            if self._render_degraded:
+                # A diagram fell back to simplified or code-block form;
+                # caching would keep serving the degraded PDF after the
+                # renderer is fixed
+                self.logger.debug(
+                    "Skipping PDF build cache: render was degraded"
+                )
+            else:
                 try:
-                    if Path(temp_file).exists():
-                        Path(temp_file).unlink()
-                        self.logger.debug(f"Cleaned up temp file: {temp_file}")
+                    self._pdf_cache_dir.mkdir(exist_ok=True)
+                    shutil.copyfile(output_path, pdf_cache_file)
+                    self.logger.debug(
+                        "Cached built PDF: %s", pdf_cache_file.name
+                    )
+                    self._prune_pdf_cache()
                 except Exception as e:
-                    self.logger.warning(f"Failed to cleanup temp file {temp_file}: {e}")
+                    self.logger.warning(f"Could not write PDF build cache: {e}")
+
+            # Clean up temporary files now that PDF is built
+            for temp_file in self.temp_files:
+                if _quiet_unlink(temp_file):
+                    self.logger.debug("Cleaned up temp file: %s", temp_file)
 
             # Clear the list for next build
             self.temp_files = []
@@ -1796,15 +2380,9 @@ class DocumentBuilder:
 
             # Clean up temporary files even on error
             for temp_file in self.temp_files:
-                try:
-                    if Path(temp_file).exists():
-                        Path(temp_file).unlink()
-                        self.logger.debug(
-                            f"Cleaned up temp file (error path): {temp_file}"
-                        )
-                except Exception as cleanup_error:
-                    self.logger.warning(
-                        f"Failed to cleanup temp file {temp_file}: {cleanup_error}"
+                if _quiet_unlink(temp_file):
+                    self.logger.debug(
+                        "Cleaned up temp file (error path): %s", temp_file
                     )
 
             # Clear the list
@@ -1813,7 +2391,12 @@ class DocumentBuilder:
             raise
 
     def build_all_documents(self) -> List[str]:
-        """Build all documents in the To_Build directory."""
+        """Build all documents in the To_Build directory.
+
+        Documents are independent of each other, so multi-file batches are
+        rendered in parallel across worker processes; single files (or single
+        CPU machines) fall back to the serial path.
+        """
         self.logger.info("=" * 60)
         self.logger.info("Building all documents")
 
@@ -1821,24 +2404,66 @@ class DocumentBuilder:
         success_count = 0
         error_count = 0
 
-        # Get all markdown and text files
-        files = list(self.to_build_dir.glob("*"))
-        valid_files = [
-            f for f in files if f.suffix.lower() in {".md", ".markdown", ".txt"}
-        ]
+        # Get all markdown and text files. scandir's DirEntry carries the
+        # file type from the directory read itself, so no per-entry stat
+        with os.scandir(self.to_build_dir) as entries:
+            valid_files = sorted(
+                (
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.is_file()
+                    and os.path.splitext(entry.name)[1].lower()
+                    in _ACCEPTED_SUFFIXES
+                ),
+                key=lambda p: p.name,
+            )
 
         self.logger.info(f"Found {len(valid_files)} documents to build")
 
-        for file_path in valid_files:
-            try:
-                self.logger.info(f"📄 Building: {file_path.name}")
-                output = self.build_document(file_path.name)
-                output_files.append(output)
-                success_count += 1
-            except Exception as e:
-                error_count += 1
-                self.logger.error(f"❌ Error building {file_path.name}: {e}")
-                self.logger.error(traceback.format_exc())
+        max_workers = min(os.cpu_count() or 1, len(valid_files))
+
+        if max_workers > 1:
+            self.logger.info(f"Building in parallel with {max_workers} workers")
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_build_worker,
+                initargs=(str(self.repo_path),),
+            ) as executor:
+                futures = {
+                    executor.submit(_build_one_document, f.name): f
+                    for f in valid_files
+                }
+                for future in as_completed(futures):
+                    file_path = futures[future]
+                    try:
+                        output_files.append(future.result())
+                        success_count += 1
+                    except Exception as e:
+                        error_count += 1
+                        self.logger.error(f"❌ Error building {file_path.name}: {e}")
+                        # The worker's traceback travels with the pickled
+                        # exception; record it like the serial branch does
+                        self.logger.error(traceback.format_exc())
+        else:
+            # Prefetch file bodies on a small thread pool so the next disk
+            # read overlaps with the current PDF build
+            with ThreadPoolExecutor(max_workers=4) as io_pool:
+                prefetched = [
+                    (f, io_pool.submit(f.read_text, encoding="utf-8"))
+                    for f in valid_files
+                ]
+                for file_path, read_future in prefetched:
+                    try:
+                        self.logger.info(f"📄 Building: {file_path.name}")
+                        output = self.build_document(
+                            file_path.name, content=read_future.result()
+                        )
+                        output_files.append(output)
+                        success_count += 1
+                    except Exception as e:
+                        error_count += 1
+                        self.logger.error(f"❌ Error building {file_path.name}: {e}")
+                        self.logger.error(traceback.format_exc())
 
         # Summary
         self.logger.info("=" * 60)
@@ -1851,6 +2476,30 @@ class DocumentBuilder:
         return output_files
 
 
+# One DocumentBuilder per worker process, created by the pool initializer so
+# fonts/styles/config are set up once per worker rather than once per document
+_WORKER_BUILDER: Optional[DocumentBuilder] = None
+
+
+def _init_build_worker(repo_path: str):
+    """Initialize a build worker process with its own DocumentBuilder."""
+    global _WORKER_BUILDER
+    # Under fork, the worker inherits the parent's QueueHandler but not
+    # its QueueListener thread, so inherited handlers would enqueue every
+    # record into a queue nobody drains. Drop them and rebuild logging
+    # with a per-worker log file so workers never race each other's
+    # rollover
+    logging.getLogger("DocumentBuilder").handlers.clear()
+    setup_logging(Path(repo_path), log_suffix=f"_worker{os.getpid()}")
+    _WORKER_BUILDER = DocumentBuilder(repo_path)
+
+
+def _build_one_document(filename: str) -> str:
+    """Build a single document inside a worker process."""
+    assert _WORKER_BUILDER is not None, "worker not initialized"
+    return _WORKER_BUILDER.build_document(filename)
+
+
 def main():
     """Main entry point for the document builder."""
     parser = argparse.ArgumentParser(